@@ -80,6 +80,12 @@ class Settings:
             'cash_drawer_enabled': 'false',
         }
         
+        # Debug settings
+        self.config['Debug'] = {
+            'profile_events': 'false',  # log Qt events slower than slow_event_ms
+            'slow_event_ms': '10',
+        }
+        
         self.save()
     
     def save(self):
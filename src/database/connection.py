@@ -1,11 +1,12 @@
 """
 Database connection management
 """
-from sqlalchemy import create_engine, event
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from loguru import logger
 from src.config.settings import get_settings
 
@@ -18,6 +19,8 @@ class DatabaseManager:
         self.settings = get_settings()
         self.engine: Optional[create_engine] = None
         self.SessionLocal: Optional[sessionmaker] = None
+        self.background_engine: Optional[create_engine] = None
+        self.BackgroundSessionLocal: Optional[sessionmaker] = None
         self._initialize_engine()
     
     def _initialize_engine(self):
@@ -28,19 +31,35 @@ class DatabaseManager:
         # SQLite connection string
         db_url = f"sqlite:///{db_path}"
         
-        # Create engine with SQLite-specific settings
+        connect_args = {
+            "check_same_thread": False,  # Allow multi-threaded access
+            "timeout": 20,  # Connection timeout
+        }
+        
+        # Create engine with SQLite-specific settings. Every session of this
+        # engine shares one connection, so it is for the GUI thread only.
         self.engine = create_engine(
             db_url,
-            connect_args={
-                "check_same_thread": False,  # Allow multi-threaded access
-                "timeout": 20,  # Connection timeout
-            },
+            connect_args=connect_args,
             poolclass=StaticPool,  # SQLite doesn't need connection pooling
             echo=False,  # Set to True for SQL query logging
         )
         
+        # Work on pool threads gets a connection of its own per session, so
+        # closing (and so rolling back) a background session can never
+        # discard a transaction the GUI thread has open. An in-memory
+        # database only exists on its one connection, so it has to share.
+        if str(db_path) == ":memory:":
+            self.background_engine = self.engine
+        else:
+            self.background_engine = create_engine(
+                db_url,
+                connect_args=connect_args,
+                poolclass=NullPool,
+                echo=False,
+            )
+        
         # Enable WAL mode for better concurrency
-        @event.listens_for(self.engine, "connect")
         def set_sqlite_pragma(dbapi_conn, connection_record):
             """Set SQLite pragmas for better performance"""
             cursor = dbapi_conn.cursor()
@@ -51,12 +70,21 @@ class DatabaseManager:
             cursor.execute("PRAGMA temp_store=MEMORY")
             cursor.close()
         
-        # Create session factory
+        event.listen(self.engine, "connect", set_sqlite_pragma)
+        if self.background_engine is not self.engine:
+            event.listen(self.background_engine, "connect", set_sqlite_pragma)
+        
+        # Create session factories
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
             bind=self.engine
         )
+        self.BackgroundSessionLocal = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=self.background_engine
+        )
         
         logger.info(f"Database engine initialized: {db_path}")
     
@@ -66,16 +94,49 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized")
         return self.SessionLocal()
     
+    def get_background_session(self) -> Session:
+        """Get a database session on its own connection, for pool threads"""
+        if self.BackgroundSessionLocal is None:
+            raise RuntimeError("Database not initialized")
+        return self.BackgroundSessionLocal()
+    
     def create_tables(self):
         """Create all database tables"""
         # Import models here to avoid circular imports
-        from src.database.models import Base
+        from src.database.models import (
+            ATTENDANCE_DEDUPLICATE, ATTENDANCE_TRIGGERS, Base
+        )
         
         Base.metadata.create_all(bind=self.engine)
+        
+        # Migrate attendance to one record per staff member and day before
+        # its unique index is added; manual entries upsert against it
+        attendance_indexes = inspect(self.engine).get_indexes('attendance')
+        if not any(index['name'] == 'uq_attendance_staff_date' for index in attendance_indexes):
+            with self.engine.begin() as conn:
+                removed = conn.execute(text(ATTENDANCE_DEDUPLICATE)).rowcount
+            if removed:
+                logger.warning(f"Removed {removed} duplicate attendance records")
+        
+        # create_all skips existing tables, so add any indexes declared
+        # after a table was first created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=self.engine, checkfirst=True)
+                except Exception as e:
+                    # e.g. legacy duplicate rows blocking a unique index
+                    logger.warning(f"Could not create index {index.name}: {e}")
+        
+        with self.engine.begin() as conn:
+            for trigger_sql in ATTENDANCE_TRIGGERS:
+                conn.execute(text(trigger_sql))
         logger.info("Database tables created")
     
     def close(self):
         """Close database connections"""
+        if self.background_engine and self.background_engine is not self.engine:
+            self.background_engine.dispose()
         if self.engine:
             self.engine.dispose()
             logger.info("Database connections closed")
@@ -97,3 +158,33 @@ def get_db_session() -> Session:
     """Get database session (convenience function)"""
     return get_db_manager().get_session()
 
+
+def get_background_session() -> Session:
+    """
+    Get a database session for work on a pool thread
+    
+    Unlike get_db_session, the session does not share the GUI thread's
+    connection, so its commits and rollbacks only ever cover its own work.
+    """
+    return get_db_manager().get_background_session()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Database session for one unit of work that writes
+    
+    Commits when the block finishes, rolls back if it raises, and always
+    closes the session. Being a GUI-thread session, the commit covers
+    everything pending on the shared connection; reads on a pool thread
+    use a plain get_background_session() instead.
+    """
+    db = get_db_session()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -5,7 +5,7 @@ SQLAlchemy ORM Models
 
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Time, Text, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Date, Time, Text, ForeignKey, JSON, UniqueConstraint, Index, column, desc
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -196,6 +196,14 @@ class Customer(BaseModel):
 class Order(BaseModel):
     """Orders table"""
     __tablename__ = 'orders'
+    __table_args__ = (
+        # Reports filter on a date range, optionally per customer or staff
+        # member; total_amount rides along so the range sums are served
+        # from the index alone (SQLite has no INCLUDE clause)
+        Index('ix_orders_dt_amount', 'order_datetime', 'total_amount'),
+        Index('ix_orders_cust_dt', 'customer_id', 'order_datetime'),
+        Index('ix_orders_staff_dt', 'staff_id', 'order_datetime'),
+    )
     
     order_id = Column(Integer, primary_key=True, autoincrement=True)
     customer_id = Column(Integer, ForeignKey('customers.customer_id'), nullable=True)  # Optional for walk-ins
@@ -413,6 +421,23 @@ class Invoice(BaseModel):
     # Relationships
     customer = relationship("Customer", backref="invoices")
     supplier = relationship("Supplier", backref="invoices")
+    invoice_items = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
+
+
+class InvoiceItem(BaseModel):
+    """Invoice line items table"""
+    __tablename__ = 'invoice_items'
+    
+    invoice_item_id = Column(Integer, primary_key=True, autoincrement=True)
+    invoice_id = Column(Integer, ForeignKey('invoices.invoice_id'), nullable=False)
+    product_id = Column(Integer, ForeignKey('products.product_id'), nullable=False)
+    quantity = Column(Float, nullable=False)
+    unit_price = Column(Float, nullable=False)  # Price at time of invoicing
+    total_price = Column(Float, nullable=False)  # quantity × unit_price
+    
+    # Relationships
+    invoice = relationship("Invoice", back_populates="invoice_items")
+    product = relationship("Product")
 
 
 class Expense(BaseModel):
@@ -480,6 +505,11 @@ class Location(BaseModel):
 class Attendance(BaseModel):
     """Staff attendance tracking"""
     __tablename__ = 'attendance'
+    __table_args__ = (
+        # One record per staff member per day; also serves the staff/date
+        # filter and lets manual entries upsert with ON CONFLICT
+        Index('uq_attendance_staff_date', 'staff_id', 'attendance_date', unique=True),
+    )
     
     attendance_id = Column(Integer, primary_key=True, autoincrement=True)
     staff_id = Column(Integer, ForeignKey('staff.staff_id'), nullable=False)
@@ -487,7 +517,7 @@ class Attendance(BaseModel):
     clock_in = Column(DateTime, nullable=True)
     clock_out = Column(DateTime, nullable=True)
     break_duration = Column(Integer, default=0, nullable=False)  # Minutes
-    total_hours = Column(Float, nullable=True)  # Calculated hours worked
+    total_hours = Column(Float, nullable=True)  # Maintained by ATTENDANCE_TRIGGERS
     status = Column(String(20), default='present', nullable=False)  # present, absent, late, on_leave
     notes = Column(Text, nullable=True)
     
@@ -495,6 +525,50 @@ class Attendance(BaseModel):
     staff = relationship("Staff", backref="attendance_records")
 
 
+# total_hours is derived in SQLite from clock_in/clock_out minus the break so
+# every writer (desktop, mobile view, API) stores the same value. Triggers are
+# used because SQLite cannot turn an existing column into a generated one.
+_ATTENDANCE_TOTAL_HOURS = """
+    UPDATE attendance
+    SET total_hours = MAX(ROUND(
+        (julianday(NEW.clock_out) - julianday(NEW.clock_in)) * 24
+        - NEW.break_duration / 60.0, 2), 0)
+    WHERE attendance_id = NEW.attendance_id;
+"""
+
+ATTENDANCE_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_attendance_hours_insert
+    AFTER INSERT ON attendance
+    WHEN NEW.clock_in IS NOT NULL AND NEW.clock_out IS NOT NULL
+    BEGIN {_ATTENDANCE_TOTAL_HOURS} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_attendance_hours_update
+    AFTER UPDATE OF clock_in, clock_out, break_duration ON attendance
+    WHEN NEW.clock_in IS NOT NULL AND NEW.clock_out IS NOT NULL
+    BEGIN {_ATTENDANCE_TOTAL_HOURS} END
+    """,
+)
+
+# Databases from before uq_attendance_staff_date can hold several records
+# for one staff member and day, which would stop the unique index from being
+# built. Keeps the most recently modified record of each day.
+ATTENDANCE_DEDUPLICATE = """
+    DELETE FROM attendance
+    WHERE attendance_id NOT IN (
+        SELECT attendance_id FROM (
+            SELECT attendance_id, ROW_NUMBER() OVER (
+                PARTITION BY staff_id, attendance_date
+                ORDER BY last_modified DESC, attendance_id DESC
+            ) AS day_rank
+            FROM attendance
+        )
+        WHERE day_rank = 1
+    )
+"""
+
+
 class ShiftSchedule(BaseModel):
     """Staff shift scheduling"""
     __tablename__ = 'shift_schedules'
@@ -624,6 +698,11 @@ class SupplierRating(BaseModel):
 class AuditLog(BaseModel):
     """Audit trail for all system changes"""
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        Index('ix_auditlog_ts_desc', desc('timestamp')),
+        # NOCASE lets SQLite serve case-insensitive prefix LIKE from the index
+        Index('ix_auditlog_table_nocase', column('table_name').collate('NOCASE')),
+    )
     
     log_id = Column(Integer, primary_key=True, autoincrement=True)
     staff_id = Column(Integer, ForeignKey('staff.staff_id'), nullable=True)
@@ -33,6 +33,7 @@ from src import __version__
 from src.gui.table_utils import install_table_auto_resize
 from src.gui.design_system import ERP_APP_BASE_STYLE
 from src.gui.design_system import install_workspace_theme
+from src.utils.event_profiler import ProfilingApplication
 
 
 def main():
@@ -44,8 +45,18 @@ def main():
     # PyQt6 has high DPI scaling enabled by default
     # No need to set these attributes (they were removed in PyQt6)
     
-    # Create application
-    app = QApplication(sys.argv)
+    # Get settings
+    settings = get_settings()
+    
+    # Create application (optionally timing every event to find UI stalls)
+    if settings.get_bool('Debug', 'profile_events', False):
+        app = ProfilingApplication(
+            sys.argv,
+            slow_event_ms=settings.get_int('Debug', 'slow_event_ms', 10)
+        )
+        logger.info("Event profiling enabled")
+    else:
+        app = QApplication(sys.argv)
     app.setApplicationName("Sphincs ERP")
     app.setApplicationVersion(__version__)
     app.setOrganizationName("Sphincs")
@@ -65,9 +76,6 @@ def main():
         # Convert QIcon to QPixmap for splash screen
         splash_icon_pixmap = icon.pixmap(128, 128)  # Use 128x128 size for splash
     
-    # Get settings
-    settings = get_settings()
-    
     # Create and show splash screen
     splash = SplashScreen(
         app_name="Sphincs ERP",
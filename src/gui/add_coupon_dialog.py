@@ -7,11 +7,13 @@ from PyQt6.QtWidgets import (
     QLineEdit, QDoubleSpinBox, QDateEdit, QFormLayout, QMessageBox,
     QComboBox, QSpinBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QRegularExpression
+from PyQt6.QtGui import QRegularExpressionValidator
 from loguru import logger
 from datetime import date
 from src.database.connection import get_db_session
 from src.database.models import Coupon
+from src.gui.coupon_redemption_dialog import COUPON_CODE_PATTERN
 
 
 class AddCouponDialog(QDialog):
@@ -37,6 +39,11 @@ class AddCouponDialog(QDialog):
         # Coupon code
         self.code_input = QLineEdit()
         self.code_input.setPlaceholderText("e.g., SAVE20, WELCOME10")
+        # Same characters the redemption dialog accepts, so every code
+        # created here can be typed in there
+        self.code_input.setValidator(
+            QRegularExpressionValidator(QRegularExpression(COUPON_CODE_PATTERN), self)
+        )
         self.code_input.textChanged.connect(self.validate_code)
         form_layout.addRow("Coupon Code *:", self.code_input)
         
@@ -4,15 +4,18 @@ Attendance Management - Staff attendance tracking (clock in/out)
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QComboBox, QDateEdit, QFrame,
-    QMessageBox, QDialog, QTimeEdit, QTextEdit, QFormLayout
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QDateEdit, QFrame,
+    QMessageBox, QDialog, QTimeEdit, QTextEdit, QFormLayout, QSpinBox
 )
 from PyQt6.QtCore import Qt, QDate, QTime
 from PyQt6.QtGui import QColor
 from loguru import logger
 from datetime import datetime, date, time
+from time import monotonic
+from sqlalchemy import String, func, literal, select
+from sqlalchemy.dialects.sqlite import insert
 from src.database.connection import get_db_session
-from src.database.models import Attendance, Staff
+from src.database.models import Attendance, Staff, utc_now_naive
 from src.gui.design_system import (
     DATA_TABLE_STYLE,
     DANGER_BUTTON_STYLE,
@@ -22,15 +25,48 @@ from src.gui.design_system import (
     SUCCESS_BUTTON_STYLE,
     TOOLBAR_CARD_STYLE,
 )
-from src.gui.table_utils import enable_table_auto_resize
+from src.gui.table_utils import batch_table_updates, enable_table_auto_resize
+from src.utils.staff_directory import get_staff_choices
+
+
+def _attendance_rows_select():
+    """
+    Core select of the attendance table columns joined to the staff name.
+    Dates and times are formatted by SQLite so rows only carry strings.
+    """
+    return select(
+        Attendance.attendance_id,
+        func.strftime("%Y-%m-%d", Attendance.attendance_date).label("date_str"),
+        func.strftime("%H:%M", Attendance.clock_in).label("clock_in_str"),
+        func.strftime("%H:%M", Attendance.clock_out).label("clock_out_str"),
+        Attendance.total_hours,
+        Attendance.status,
+        Attendance.notes,
+        Staff.first_name,
+        Staff.last_name,
+    ).join(Staff, Attendance.staff_id == Staff.staff_id)
+
+
+# Status colors, built once instead of per table row
+_STATUS_COLORS = {
+    "present": QColor("#14B8A6"),
+    "absent": QColor("#D92D20"),
+    "late": QColor("#F59E0B"),
+}
 
 
 class AttendanceManagementView(QWidget):
     """Attendance Management View"""
     
+    DEFAULT_PAGE_SIZE = 100
+    RESULT_CACHE_SECONDS = 30
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
+        self._last_filter_key = None
+        self._last_loaded_at = 0.0
+        self._attendance_rows = {}
         self.setup_ui()
         self.load_attendance()
     
@@ -47,6 +83,7 @@ class AttendanceManagementView(QWidget):
         # Clock In/Out button
         self.clock_btn = QPushButton("Clock In")
         self.clock_btn.setStyleSheet(SUCCESS_BUTTON_STYLE)
+        self._clocked_in = False
         self.clock_btn.clicked.connect(self.handle_clock_in_out)
         header_layout.addWidget(self.clock_btn)
         
@@ -89,9 +126,26 @@ class AttendanceManagementView(QWidget):
         
         filter_btn = QPushButton("Filter")
         filter_btn.setStyleSheet(SECONDARY_BUTTON_STYLE)
-        filter_btn.clicked.connect(self.load_attendance)
+        filter_btn.clicked.connect(self.apply_filters)
         filter_layout.addWidget(filter_btn)
         
+        # Server-side paging keeps wide date ranges bounded
+        filter_layout.addWidget(QLabel("Page:"))
+        self.page_spin = QSpinBox()
+        self.page_spin.setRange(1, 9999)
+        self.page_spin.setStyleSheet(FILTER_COMBO_STYLE)
+        self.page_spin.valueChanged.connect(self.load_attendance)
+        filter_layout.addWidget(self.page_spin)
+        
+        filter_layout.addWidget(QLabel("Rows:"))
+        self.page_size_spin = QSpinBox()
+        self.page_size_spin.setRange(25, 1000)
+        self.page_size_spin.setSingleStep(25)
+        self.page_size_spin.setValue(self.DEFAULT_PAGE_SIZE)
+        self.page_size_spin.setStyleSheet(FILTER_COMBO_STYLE)
+        self.page_size_spin.valueChanged.connect(self.apply_filters)
+        filter_layout.addWidget(self.page_size_spin)
+        
         filter_layout.addStretch()
         layout.addWidget(filter_card)
         layout.addSpacing(12)
@@ -103,7 +157,11 @@ class AttendanceManagementView(QWidget):
             "Date", "Staff", "Clock In", "Clock Out", "Hours", "Status", "Notes"
         ])
         self.attendance_table.setStyleSheet(DATA_TABLE_STYLE)
-        enable_table_auto_resize(self.attendance_table)
+        # Interactive sizing: columns are fitted once per load instead of
+        # being re-measured across every row on each change
+        enable_table_auto_resize(
+            self.attendance_table, mode=QHeaderView.ResizeMode.Interactive
+        )
         self.attendance_table.setAlternatingRowColors(True)
         layout.addWidget(self.attendance_table)
         
@@ -113,95 +171,167 @@ class AttendanceManagementView(QWidget):
     def load_staff_combo(self):
         """Load staff into combo box"""
         try:
-            db = get_db_session()
-            staff_list = db.query(Staff).filter(Staff.status == 'active').all()
-            for staff in staff_list:
-                self.staff_combo.addItem(
-                    f"{staff.first_name} {staff.last_name}",
-                    staff.staff_id
-                )
-            db.close()
+            for staff_id, full_name in get_staff_choices(active_only=True):
+                self.staff_combo.addItem(full_name, staff_id)
         except Exception as e:
             logger.error(f"Error loading staff combo: {e}")
     
-    def load_attendance(self):
-        """Load attendance records"""
-        try:
+    def apply_filters(self):
+        """Reload attendance from the first page"""
+        self.page_spin.blockSignals(True)
+        self.page_spin.setValue(1)
+        self.page_spin.blockSignals(False)
+        self.load_attendance()
+    
+    def load_attendance(self, *, db=None):
+        """Load the current page of attendance records
+        
+        Args:
+            db: Open session to reuse; a short-lived one is used otherwise
+        """
+        # ISO strings compare like the dates SQLite stores, so the QDate
+        # values are bound as text without a Python date round-trip
+        from_date = self.from_date.date().toString(Qt.DateFormat.ISODate)
+        to_date = self.to_date.date().toString(Qt.DateFormat.ISODate)
+        if from_date > to_date:
+            QMessageBox.warning(self, "Invalid Range", "The From date must be on or before the To date.")
+            return
+        
+        staff_filter = self.staff_combo.currentData()
+        page = self.page_spin.value()
+        page_size = self.page_size_spin.value()
+        
+        # The same filters loaded moments ago are already on screen
+        filter_key = (from_date, to_date, staff_filter, page, page_size)
+        if (
+            filter_key == self._last_filter_key
+            and monotonic() - self._last_loaded_at < self.RESULT_CACHE_SECONDS
+        ):
+            return
+        
+        owns_session = db is None
+        if owns_session:
             db = get_db_session()
-            from_date = self.from_date.date().toPyDate()
-            to_date = self.to_date.date().toPyDate()
-            
-            query = db.query(Attendance).filter(
-                Attendance.attendance_date >= from_date,
-                Attendance.attendance_date <= to_date
+        try:
+            stmt = _attendance_rows_select().where(
+                Attendance.attendance_date >= literal(from_date, String),
+                Attendance.attendance_date <= literal(to_date, String)
             )
             
-            staff_filter = self.staff_combo.currentData()
             if staff_filter:
-                query = query.filter(Attendance.staff_id == staff_filter)
+                stmt = stmt.where(Attendance.staff_id == staff_filter)
             
-            records = query.order_by(Attendance.attendance_date.desc(), Attendance.clock_in.desc()).all()
+            offset = (page - 1) * page_size
+            stmt = stmt.order_by(
+                Attendance.attendance_date.desc(), Attendance.clock_in.desc()
+            ).limit(page_size).offset(offset)
+            records = db.execute(stmt).all()
             
-            self.attendance_table.setRowCount(len(records))
-            for row, record in enumerate(records):
-                self.attendance_table.setItem(row, 0, QTableWidgetItem(
-                    record.attendance_date.strftime("%Y-%m-%d")
-                ))
-                staff_name = f"{record.staff.first_name} {record.staff.last_name}"
-                self.attendance_table.setItem(row, 1, QTableWidgetItem(staff_name))
-                
-                clock_in = record.clock_in.strftime("%H:%M") if record.clock_in else "-"
-                self.attendance_table.setItem(row, 2, QTableWidgetItem(clock_in))
-                
-                clock_out = record.clock_out.strftime("%H:%M") if record.clock_out else "-"
-                self.attendance_table.setItem(row, 3, QTableWidgetItem(clock_out))
-                
-                hours = f"{record.total_hours:.2f}" if record.total_hours else "-"
-                self.attendance_table.setItem(row, 4, QTableWidgetItem(hours))
-                
-                status_item = QTableWidgetItem(record.status)
-                if record.status == "present":
-                    status_item.setForeground(QColor("#14B8A6"))
-                elif record.status == "absent":
-                    status_item.setForeground(QColor("#D92D20"))
-                elif record.status == "late":
-                    status_item.setForeground(QColor("#F59E0B"))
-                self.attendance_table.setItem(row, 5, status_item)
-                
-                self.attendance_table.setItem(row, 6, QTableWidgetItem(record.notes or ""))
+            with batch_table_updates(self.attendance_table):
+                self.attendance_table.setRowCount(len(records))
+                for row, record in enumerate(records):
+                    self._set_attendance_row(row, record)
+                self.attendance_table.resizeColumnsToContents()
+            self._attendance_rows = {
+                record.attendance_id: row for row, record in enumerate(records)
+            }
             
-            db.close()
+            self._last_filter_key = filter_key
+            self._last_loaded_at = monotonic()
         except Exception as e:
             logger.error(f"Error loading attendance: {e}")
             QMessageBox.critical(self, "Error", f"Failed to load attendance: {str(e)}")
+        finally:
+            if owns_session:
+                db.close()
     
-    def update_clock_button_state(self):
-        """Update clock in/out button based on current status"""
-        try:
+    def _set_attendance_row(self, row: int, record):
+        """Write one attendance row from a _attendance_rows_select() result"""
+        self.attendance_table.setItem(row, 0, QTableWidgetItem(record.date_str))
+        staff_name = f"{record.first_name} {record.last_name}"
+        self.attendance_table.setItem(row, 1, QTableWidgetItem(staff_name))
+        
+        self.attendance_table.setItem(row, 2, QTableWidgetItem(record.clock_in_str or "-"))
+        self.attendance_table.setItem(row, 3, QTableWidgetItem(record.clock_out_str or "-"))
+        
+        hours = f"{record.total_hours:.2f}" if record.total_hours else "-"
+        self.attendance_table.setItem(row, 4, QTableWidgetItem(hours))
+        
+        status_item = QTableWidgetItem(record.status)
+        status_color = _STATUS_COLORS.get(record.status)
+        if status_color is not None:
+            status_item.setForeground(status_color)
+        self.attendance_table.setItem(row, 5, status_item)
+        
+        self.attendance_table.setItem(row, 6, QTableWidgetItem(record.notes or ""))
+    
+    def refresh_attendance_row(self, attendance_id: int, *, db) -> bool:
+        """
+        Re-read a single displayed attendance record in place
+        
+        Returns:
+            False if the record is not on the current page
+        """
+        row = self._attendance_rows.get(attendance_id)
+        if row is None:
+            return False
+        record = db.execute(
+            _attendance_rows_select().where(Attendance.attendance_id == attendance_id)
+        ).first()
+        if record is None:
+            return False
+        self._set_attendance_row(row, record)
+        return True
+    
+    def invalidate_attendance_cache(self):
+        """Force the next load_attendance call to query the database"""
+        self._last_filter_key = None
+    
+    def update_clock_button_state(self, *, db=None):
+        """Update clock in/out button based on current status
+        
+        Args:
+            db: Open session to reuse; a short-lived one is used otherwise
+        """
+        owns_session = db is None
+        if owns_session:
             db = get_db_session()
+        try:
             today = date.today()
             
-            # Check if current user has clocked in today
-            attendance = db.query(Attendance).filter(
-                Attendance.staff_id == self.user_id,
-                Attendance.attendance_date == today
-            ).first()
+            # Check if current user has an open clock-in today
+            clocked_in = db.query(
+                db.query(Attendance).filter(
+                    Attendance.staff_id == self.user_id,
+                    Attendance.attendance_date == today,
+                    Attendance.clock_in.isnot(None),
+                    Attendance.clock_out.is_(None)
+                ).exists()
+            ).scalar()
             
-            if attendance and attendance.clock_in and not attendance.clock_out:
-                self.clock_btn.setText("Clock Out")
-                self.clock_btn.setStyleSheet(DANGER_BUTTON_STYLE)
-            else:
-                self.clock_btn.setText("Clock In")
-                self.clock_btn.setStyleSheet(SUCCESS_BUTTON_STYLE)
-            
-            db.close()
+            self._set_clock_state(bool(clocked_in))
         except Exception as e:
             logger.error(f"Error updating clock button state: {e}")
+        finally:
+            if owns_session:
+                db.close()
+    
+    def _set_clock_state(self, clocked_in: bool):
+        """Restyle the clock button only when the clocked-in state flips"""
+        if clocked_in == self._clocked_in:
+            return
+        self._clocked_in = clocked_in
+        if clocked_in:
+            self.clock_btn.setText("Clock Out")
+            self.clock_btn.setStyleSheet(DANGER_BUTTON_STYLE)
+        else:
+            self.clock_btn.setText("Clock In")
+            self.clock_btn.setStyleSheet(SUCCESS_BUTTON_STYLE)
     
     def handle_clock_in_out(self):
         """Handle clock in/out"""
+        db = get_db_session()
         try:
-            db = get_db_session()
             today = date.today()
             now = datetime.now()
             
@@ -212,19 +342,10 @@ class AttendanceManagementView(QWidget):
             ).first()
             
             if attendance and attendance.clock_in and not attendance.clock_out:
-                # Clock out
+                # Clock out (total_hours is filled in by the database trigger)
                 attendance.clock_out = now
-                
-                # Calculate total hours
-                if attendance.clock_in:
-                    delta = now - attendance.clock_in
-                    total_seconds = delta.total_seconds() - (attendance.break_duration * 60)
-                    total_hours = total_seconds / 3600
-                    attendance.total_hours = round(total_hours, 2)
-                    attendance.status = "present"
-                
-                db.commit()
-                QMessageBox.information(self, "Success", "Clocked out successfully")
+                attendance.status = "present"
+                message = "Clocked out successfully"
             else:
                 # Clock in
                 if not attendance:
@@ -238,28 +359,48 @@ class AttendanceManagementView(QWidget):
                 else:
                     attendance.clock_in = now
                     attendance.status = "present"
-                
-                db.commit()
-                QMessageBox.information(self, "Success", "Clocked in successfully")
+                message = "Clocked in successfully"
             
-            db.close()
-            self.update_clock_button_state()
-            self.load_attendance()
+            db.flush()
+            attendance_id = attendance.attendance_id
+            db.commit()
+            QMessageBox.information(self, "Success", message)
+            
+            # Refresh through the same session; only the touched row is
+            # re-read unless it is not on the current page
+            self.update_clock_button_state(db=db)
+            if not self.refresh_attendance_row(attendance_id, db=db):
+                self.invalidate_attendance_cache()
+                self.load_attendance(db=db)
             
         except Exception as e:
             logger.error(f"Error clocking in/out: {e}")
             QMessageBox.critical(self, "Error", f"Failed to clock in/out: {str(e)}")
+        finally:
+            db.close()
     
     def handle_manual_entry(self):
         """Handle manual attendance entry"""
         dialog = ManualAttendanceDialog(self.user_id, self)
         if dialog.exec():
+            self.invalidate_attendance_cache()
             self.load_attendance()
 
 
 class ManualAttendanceDialog(QDialog):
     """Dialog for manual attendance entry"""
     
+    SAVE_BUTTON_STYLE = """
+        QPushButton {
+            background-color: #2F7DFF;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: 600;
+        }
+    """
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
@@ -325,16 +466,7 @@ class ManualAttendanceDialog(QDialog):
         buttons_layout.addWidget(cancel_btn)
         
         save_btn = QPushButton("Save")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: 600;
-            }
-        """)
+        save_btn.setStyleSheet(self.SAVE_BUTTON_STYLE)
         save_btn.clicked.connect(self.handle_save)
         buttons_layout.addWidget(save_btn)
         
@@ -343,14 +475,8 @@ class ManualAttendanceDialog(QDialog):
     def load_staff(self):
         """Load staff into combo"""
         try:
-            db = get_db_session()
-            staff_list = db.query(Staff).filter(Staff.status == 'active').all()
-            for staff in staff_list:
-                self.staff_combo.addItem(
-                    f"{staff.first_name} {staff.last_name}",
-                    staff.staff_id
-                )
-            db.close()
+            for staff_id, full_name in get_staff_choices(active_only=True):
+                self.staff_combo.addItem(full_name, staff_id)
         except Exception as e:
             logger.error(f"Error loading staff: {e}")
     
@@ -368,37 +494,26 @@ class ManualAttendanceDialog(QDialog):
             clock_in = datetime.combine(attendance_date, clock_in_time)
             clock_out = datetime.combine(attendance_date, clock_out_time)
             
-            # Calculate hours
-            delta = clock_out - clock_in
-            total_seconds = delta.total_seconds() - (self.break_duration.value() * 60)
-            total_hours = total_seconds / 3600
-            
-            # Check if record exists
-            attendance = db.query(Attendance).filter(
-                Attendance.staff_id == staff_id,
-                Attendance.attendance_date == attendance_date
-            ).first()
-            
-            if attendance:
-                attendance.clock_in = clock_in
-                attendance.clock_out = clock_out
-                attendance.break_duration = self.break_duration.value()
-                attendance.total_hours = round(total_hours, 2)
-                attendance.status = self.status_combo.currentText()
-                attendance.notes = self.notes_input.toPlainText()
-            else:
-                attendance = Attendance(
-                    staff_id=staff_id,
-                    attendance_date=attendance_date,
-                    clock_in=clock_in,
-                    clock_out=clock_out,
-                    break_duration=self.break_duration.value(),
-                    total_hours=round(total_hours, 2),
-                    status=self.status_combo.currentText(),
-                    notes=self.notes_input.toPlainText()
-                )
-                db.add(attendance)
+            # total_hours is derived from these by the database trigger
+            values = {
+                "clock_in": clock_in,
+                "clock_out": clock_out,
+                "break_duration": self.break_duration.value(),
+                "status": self.status_combo.currentText(),
+                "notes": self.notes_input.toPlainText(),
+            }
             
+            # Insert or overwrite the staff member's record for that day in
+            # one statement (ON CONFLICT on uq_attendance_staff_date)
+            stmt = insert(Attendance).values(
+                staff_id=staff_id,
+                attendance_date=attendance_date,
+                **values
+            ).on_conflict_do_update(
+                index_elements=[Attendance.staff_id, Attendance.attendance_date],
+                set_={**values, "last_modified": utc_now_naive()}
+            )
+            db.execute(stmt)
             db.commit()
             db.close()
             
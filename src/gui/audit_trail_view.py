@@ -4,23 +4,108 @@ Audit Trail View - View system audit logs
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QComboBox, QDateEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QDateEdit,
     QMessageBox, QLineEdit
 )
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QColor
 from loguru import logger
-from datetime import datetime
-from src.database.connection import get_db_session
+from time import monotonic
+from sqlalchemy import String, case, func, literal, select
+from src.database.connection import get_background_session
 from src.database.models import AuditLog, Staff
+from src.gui.table_utils import batch_table_updates, enable_table_auto_resize
+from src.utils.background_tasks import run_in_background
+from src.utils.staff_directory import get_staff_choices
+
+
+# Action colors, built once instead of per table row
+_ACTION_COLORS = {
+    "delete": QColor("#D92D20"),
+    "create": QColor("#14B8A6"),
+    "update": QColor("#F59E0B"),
+}
+
+
+def _json_field_count(column):
+    """Count the keys of a JSON object column in SQL (0 for NULL or JSON null)."""
+    key_count = (
+        select(func.count())
+        .select_from(func.json_each(column).table_valued("key"))
+        .scalar_subquery()
+    )
+    return case((func.json_type(column) == "object", key_count), else_=0)
+
+
+def _like_prefix(text: str) -> str:
+    """Build an escaped LIKE pattern matching values that start with text."""
+    escaped = text.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return f"{escaped}%"
+
+
+def _fetch_audit_logs(filter_key, end_date: str):
+    """
+    Query audit log rows for the given filters (runs on a pool thread)
+    
+    Args:
+        filter_key: (from_date, to_date, staff_id, action, table prefix)
+        end_date: ISO date of the day after to_date (exclusive bound)
+    
+    Returns:
+        (filter_key, rows) so results can be matched to the request
+    """
+    from_date, _to_date, staff_filter, action_filter, table_filter = filter_key
+    db = get_background_session()
+    try:
+        # Project only the displayed columns; the JSON payloads are
+        # reduced to field counts in SQL instead of being shipped back.
+        query = db.query(
+            func.strftime("%Y-%m-%d %H:%M:%S", AuditLog.timestamp).label("ts_str"),
+            AuditLog.action,
+            AuditLog.table_name,
+            AuditLog.record_id,
+            AuditLog.ip_address,
+            _json_field_count(AuditLog.new_values).label("n_new"),
+            _json_field_count(AuditLog.old_values).label("n_old"),
+            Staff.first_name,
+            Staff.last_name,
+        ).outerjoin(
+            Staff, AuditLog.staff_id == Staff.staff_id
+        ).filter(
+            AuditLog.timestamp >= literal(from_date, String),
+            AuditLog.timestamp < literal(end_date, String)
+        )
+        
+        # Apply filters
+        if staff_filter:
+            query = query.filter(AuditLog.staff_id == staff_filter)
+        
+        if action_filter != "All Actions":
+            query = query.filter(AuditLog.action == action_filter)
+        
+        if table_filter:
+            # Prefix match (SQLite LIKE is case-insensitive) can use the
+            # NOCASE table_name index; a leading wildcard cannot
+            query = query.filter(
+                AuditLog.table_name.like(_like_prefix(table_filter), escape="/")
+            )
+        
+        return filter_key, query.order_by(AuditLog.timestamp.desc()).limit(500).all()
+    finally:
+        db.close()
 
 
 class AuditTrailView(QWidget):
     """Audit Trail View"""
     
+    RESULT_CACHE_SECONDS = 30
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
+        self._last_filter_key = None
+        self._last_loaded_at = 0.0
+        self._pending_filter_key = None
         self.setup_ui()
         self.load_audit_logs()
     
@@ -64,7 +149,7 @@ class AuditTrailView(QWidget):
         
         filter_layout.addWidget(QLabel("Table:"))
         self.table_input = QLineEdit()
-        self.table_input.setPlaceholderText("Filter by table name...")
+        self.table_input.setPlaceholderText("Table name starts with...")
         filter_layout.addWidget(self.table_input)
         
         filter_layout.addWidget(QLabel("From:"))
@@ -116,87 +201,106 @@ class AuditTrailView(QWidget):
                 font-weight: 600;
             }
         """)
-        self.audit_table.horizontalHeader().setStretchLastSection(True)
+        # Interactive sizing: columns are fitted once per load instead of
+        # being re-measured across every row on each change
+        enable_table_auto_resize(
+            self.audit_table, mode=QHeaderView.ResizeMode.Interactive
+        )
         self.audit_table.setAlternatingRowColors(True)
         layout.addWidget(self.audit_table)
     
     def load_staff_combo(self):
         """Load staff into combo"""
         try:
-            db = get_db_session()
-            staff_list = db.query(Staff).all()
-            for staff in staff_list:
-                self.staff_combo.addItem(
-                    f"{staff.first_name} {staff.last_name}",
-                    staff.staff_id
-                )
-            db.close()
+            for staff_id, full_name in get_staff_choices(active_only=False):
+                self.staff_combo.addItem(full_name, staff_id)
         except Exception as e:
             logger.error(f"Error loading staff combo: {e}")
     
     def load_audit_logs(self):
         """Load audit logs"""
+        # ISO strings compare like the timestamps SQLite stores, so the
+        # range is bound as text: [from day, day after to day)
+        from_date = self.from_date.date().toString(Qt.DateFormat.ISODate)
+        to_date = self.to_date.date().toString(Qt.DateFormat.ISODate)
+        if from_date > to_date:
+            QMessageBox.warning(self, "Invalid Range", "The From date must be on or before the To date.")
+            return
+        
+        staff_filter = self.staff_combo.currentData()
+        action_filter = self.action_combo.currentText()
+        table_filter = self.table_input.text().strip()
+        
+        # The same filters loaded moments ago are already on screen
+        filter_key = (from_date, to_date, staff_filter, action_filter, table_filter)
+        if (
+            filter_key == self._last_filter_key
+            and monotonic() - self._last_loaded_at < self.RESULT_CACHE_SECONDS
+        ):
+            return
+        
+        # Identical query already running
+        if filter_key == self._pending_filter_key:
+            return
+        self._pending_filter_key = filter_key
+        
+        end_date = self.to_date.date().addDays(1).toString(Qt.DateFormat.ISODate)
+        run_in_background(
+            _fetch_audit_logs,
+            filter_key,
+            end_date,
+            on_finished=self._on_audit_logs_loaded,
+            on_failed=self._on_audit_logs_failed,
+        )
+    
+    def _on_audit_logs_loaded(self, result):
+        """Populate the table with rows fetched by _fetch_audit_logs"""
+        filter_key, logs = result
+        if filter_key != self._pending_filter_key:
+            # Superseded by a newer filter while this one was running
+            return
+        self._pending_filter_key = None
+        
         try:
-            db = get_db_session()
-            from_date = self.from_date.date().toPyDate()
-            to_date = self.to_date.date().toPyDate()
-            
-            query = db.query(AuditLog).filter(
-                AuditLog.timestamp >= datetime.combine(from_date, datetime.min.time()),
-                AuditLog.timestamp <= datetime.combine(to_date, datetime.max.time())
-            )
-            
-            # Apply filters
-            staff_filter = self.staff_combo.currentData()
-            if staff_filter:
-                query = query.filter(AuditLog.staff_id == staff_filter)
-            
-            action_filter = self.action_combo.currentText()
-            if action_filter != "All Actions":
-                query = query.filter(AuditLog.action == action_filter)
-            
-            table_filter = self.table_input.text().strip()
-            if table_filter:
-                query = query.filter(AuditLog.table_name.ilike(f"%{table_filter}%"))
-            
-            logs = query.order_by(AuditLog.timestamp.desc()).limit(500).all()
-            
-            self.audit_table.setRowCount(len(logs))
-            for row, log in enumerate(logs):
-                self.audit_table.setItem(row, 0, QTableWidgetItem(
-                    log.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                ))
+            with batch_table_updates(self.audit_table):
+                self.audit_table.setRowCount(len(logs))
+                for row, log in enumerate(logs):
+                    self.audit_table.setItem(row, 0, QTableWidgetItem(log.ts_str))
                 
-                staff_name = "-"
-                if log.staff:
-                    staff_name = f"{log.staff.first_name} {log.staff.last_name}"
-                self.audit_table.setItem(row, 1, QTableWidgetItem(staff_name))
+                    staff_name = "-"
+                    if log.first_name is not None:
+                        staff_name = f"{log.first_name} {log.last_name}"
+                    self.audit_table.setItem(row, 1, QTableWidgetItem(staff_name))
                 
-                action_item = QTableWidgetItem(log.action)
-                if log.action == "delete":
-                    action_item.setForeground(QColor("#D92D20"))
-                elif log.action == "create":
-                    action_item.setForeground(QColor("#14B8A6"))
-                elif log.action == "update":
-                    action_item.setForeground(QColor("#F59E0B"))
-                self.audit_table.setItem(row, 2, action_item)
+                    action_item = QTableWidgetItem(log.action)
+                    action_color = _ACTION_COLORS.get(log.action)
+                    if action_color is not None:
+                        action_item.setForeground(action_color)
+                    self.audit_table.setItem(row, 2, action_item)
                 
-                self.audit_table.setItem(row, 3, QTableWidgetItem(log.table_name))
-                self.audit_table.setItem(row, 4, QTableWidgetItem(str(log.record_id) if log.record_id else "-"))
-                self.audit_table.setItem(row, 5, QTableWidgetItem(log.ip_address or "-"))
+                    self.audit_table.setItem(row, 3, QTableWidgetItem(log.table_name))
+                    self.audit_table.setItem(row, 4, QTableWidgetItem(str(log.record_id) if log.record_id else "-"))
+                    self.audit_table.setItem(row, 5, QTableWidgetItem(log.ip_address or "-"))
                 
-                # Details (show changes summary)
-                details = ""
-                if log.old_values and log.new_values:
-                    details = f"Updated: {len(log.new_values)} fields"
-                elif log.new_values:
-                    details = f"Created: {len(log.new_values)} fields"
-                elif log.old_values:
-                    details = "Deleted"
-                self.audit_table.setItem(row, 6, QTableWidgetItem(details))
+                    # Details (show changes summary)
+                    details = ""
+                    if log.n_old and log.n_new:
+                        details = f"Updated: {log.n_new} fields"
+                    elif log.n_new:
+                        details = f"Created: {log.n_new} fields"
+                    elif log.n_old:
+                        details = "Deleted"
+                    self.audit_table.setItem(row, 6, QTableWidgetItem(details))
+                self.audit_table.resizeColumnsToContents()
             
-            db.close()
+            self._last_filter_key = filter_key
+            self._last_loaded_at = monotonic()
         except Exception as e:
             logger.error(f"Error loading audit logs: {e}")
             QMessageBox.critical(self, "Error", f"Failed to load audit logs: {str(e)}")
+    
+    def _on_audit_logs_failed(self, error: str):
+        """Report a failed background audit log query"""
+        self._pending_filter_key = None
+        QMessageBox.critical(self, "Error", f"Failed to load audit logs: {error}")
 
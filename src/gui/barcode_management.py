@@ -4,24 +4,174 @@ Barcode Management - Manage barcodes for products and ingredients
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QDialog, QComboBox,
+    QTableView, QHeaderView, QDialog, QComboBox,
     QMessageBox, QFormLayout, QLineEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
 from PyQt6.QtGui import QColor
 from loguru import logger
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from src.database.connection import get_db_session
 from src.database.models import Barcode, Product, Ingredient
+from src.gui.table_utils import batch_table_updates, enable_table_auto_resize
+
+
+# Stylesheets shared by every view and dialog instance
+BARCODE_TITLE_STYLE = """
+    color: #162640;
+    font-size: 24px;
+    font-weight: 700;
+"""
+
+BARCODE_ADD_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #2F7DFF;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 10px 20px;
+        font-size: 14px;
+        font-weight: 600;
+    }
+    QPushButton:hover {
+        background-color: #1D66EA;
+    }
+"""
+
+BARCODE_TABLE_STYLE = """
+    QTableView {
+        border: 1px solid #C8D4E8;
+        border-radius: 8px;
+        gridline-color: #EDF3FC;
+    }
+    QHeaderView::section {
+        background-color: #F9FAFB;
+        padding: 10px;
+        border: none;
+        border-bottom: 2px solid #C8D4E8;
+        font-weight: 600;
+    }
+"""
+
+BARCODE_SAVE_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #2F7DFF;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-weight: 600;
+    }
+"""
+
+# Status foreground for inactive barcodes, built once rather than per data() call
+_INACTIVE_FOREGROUND = QColor("#8FA2BF")
+
+
+class BarcodeTableModel(QAbstractTableModel):
+    """
+    Table model serving barcode rows to the view on demand
+    
+    Rows are fetched a page at a time: the view calls fetchMore() as the
+    user scrolls towards the bottom of what has been loaded so far.
+    """
+    
+    HEADERS = ["Barcode", "Type", "Barcode Type", "Item Name", "Status"]
+    PAGE_SIZE = 100
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._total_count = 0
+        self._fetch_page = None
+    
+    def reset_query(self, fetch_page, total_count: int):
+        """
+        Start over with a new query, loading its first page
+        
+        Args:
+            fetch_page: Callable (offset, limit) -> list of rows
+            total_count: Number of rows the query matches
+        """
+        self.beginResetModel()
+        self._fetch_page = fetch_page
+        self._total_count = total_count
+        self._rows = list(fetch_page(0, self.PAGE_SIZE)) if total_count else []
+        self.endResetModel()
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total_count
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            page = self._fetch_page(len(self._rows), self.PAGE_SIZE)
+        except Exception as e:
+            # Stop paging rather than retrying on every scroll
+            logger.error(f"Error loading more barcodes: {e}")
+            self._total_count = len(self._rows)
+            return
+        if not page:
+            self._total_count = len(self._rows)
+            return
+        
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        barcode = self._rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return barcode.barcode_value
+            if column == 1:
+                return barcode.item_type
+            if column == 2:
+                return barcode.barcode_type or "EAN-13"
+            if column == 3:
+                return barcode.item_name
+            if column == 4:
+                return "Active" if barcode.is_active else "Inactive"
+        elif role == Qt.ItemDataRole.ForegroundRole:
+            if column == 4 and not barcode.is_active:
+                return _INACTIVE_FOREGROUND
+        return None
 
 
 class BarcodeManagementView(QWidget):
     """Barcode Management View"""
     
+    FILTER_DEBOUNCE_MS = 150
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
+        # One session for the lifetime of the view, reused by every action;
+        # embedded views may never get a closeEvent, so also close on destroy
+        self.db = get_db_session()
+        self.destroyed.connect(self.db.close)
         self.setup_ui()
-        self.load_barcodes()
+        # Let the view paint first; rows arrive once the event loop runs
+        QTimer.singleShot(0, self.load_barcodes)
     
     def setup_ui(self):
         """Setup barcode management UI"""
@@ -33,30 +183,13 @@ class BarcodeManagementView(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("Barcode Management")
-        title.setStyleSheet("""
-            color: #162640;
-            font-size: 24px;
-            font-weight: 700;
-        """)
+        title.setStyleSheet(BARCODE_TITLE_STYLE)
         header_layout.addWidget(title)
         header_layout.addStretch()
         
         # Add Barcode button
         add_btn = QPushButton("Add Barcode")
-        add_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #1D66EA;
-            }
-        """)
+        add_btn.setStyleSheet(BARCODE_ADD_BUTTON_STYLE)
         add_btn.clicked.connect(self.handle_add_barcode)
         header_layout.addWidget(add_btn)
         
@@ -70,7 +203,13 @@ class BarcodeManagementView(QWidget):
         filter_layout.addWidget(QLabel("Type:"))
         self.type_combo = QComboBox()
         self.type_combo.addItems(["All", "Product", "Ingredient"])
-        self.type_combo.currentTextChanged.connect(self.load_barcodes)
+        # Coalesce rapid type changes (e.g. arrowing through the combo)
+        # into one reload once the selection settles
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._reload_timer.timeout.connect(self.load_barcodes)
+        self.type_combo.currentTextChanged.connect(self._reload_timer.start)
         filter_layout.addWidget(self.type_combo)
         
         filter_layout.addStretch()
@@ -78,84 +217,92 @@ class BarcodeManagementView(QWidget):
         layout.addSpacing(16)
         
         # Barcodes table
-        self.barcodes_table = QTableWidget()
-        self.barcodes_table.setColumnCount(5)
-        self.barcodes_table.setHorizontalHeaderLabels([
-            "Barcode", "Type", "Barcode Type", "Item Name", "Status"
-        ])
-        self.barcodes_table.setStyleSheet("""
-            QTableWidget {
-                border: 1px solid #C8D4E8;
-                border-radius: 8px;
-                gridline-color: #EDF3FC;
-            }
-            QHeaderView::section {
-                background-color: #F9FAFB;
-                padding: 10px;
-                border: none;
-                border-bottom: 2px solid #C8D4E8;
-                font-weight: 600;
-            }
-        """)
-        self.barcodes_table.horizontalHeader().setStretchLastSection(True)
+        # Model/view: cells are served from a plain list of rows instead
+        # of one QTableWidgetItem per cell
+        self.barcodes_model = BarcodeTableModel(self)
+        self.barcodes_table = QTableView()
+        self.barcodes_table.setModel(self.barcodes_model)
+        self.barcodes_table.setStyleSheet(BARCODE_TABLE_STYLE)
+        # Interactive sizing: columns are fitted once per load instead of
+        # being re-measured across every row on each model reset
+        enable_table_auto_resize(
+            self.barcodes_table, mode=QHeaderView.ResizeMode.Interactive
+        )
         self.barcodes_table.setAlternatingRowColors(True)
         layout.addWidget(self.barcodes_table)
     
     def load_barcodes(self):
         """Load barcodes"""
         try:
-            db = get_db_session()
-            
-            query = db.query(Barcode)
+            # Drop identity-map state so other screens' changes are seen
+            self.db.expire_all()
             
+            conditions = []
             type_filter = self.type_combo.currentText()
             if type_filter == "Product":
-                query = query.filter(Barcode.product_id.isnot(None))
+                conditions.append(Barcode.product_id.isnot(None))
             elif type_filter == "Ingredient":
-                query = query.filter(Barcode.ingredient_id.isnot(None))
+                conditions.append(Barcode.ingredient_id.isnot(None))
+            
+            total_count = self.db.execute(
+                select(func.count()).select_from(Barcode).where(*conditions)
+            ).scalar_one()
             
-            barcodes = query.all()
+            # Select just the displayed columns, joining the item names in
+            # the same query rather than hydrating Barcode/Product/Ingredient.
+            # The item type/name branching is evaluated in SQL as well.
+            # A stable order keeps LIMIT/OFFSET pages from overlapping.
+            is_product = Barcode.product_id.isnot(None)
+            stmt = select(
+                Barcode.barcode_value,
+                Barcode.barcode_type,
+                Barcode.is_active,
+                case((is_product, "Product"), else_="Ingredient").label("item_type"),
+                func.coalesce(
+                    case((is_product, Product.name), else_=Ingredient.name), "-"
+                ).label("item_name"),
+            ).select_from(Barcode).outerjoin(
+                Product, Barcode.product_id == Product.product_id
+            ).outerjoin(
+                Ingredient, Barcode.ingredient_id == Ingredient.ingredient_id
+            ).where(*conditions).order_by(Barcode.barcode_id)
             
-            self.barcodes_table.setRowCount(len(barcodes))
-            for row, barcode in enumerate(barcodes):
-                self.barcodes_table.setItem(row, 0, QTableWidgetItem(barcode.barcode_value))
-                
-                item_type = "Product" if barcode.product_id else "Ingredient"
-                self.barcodes_table.setItem(row, 1, QTableWidgetItem(item_type))
-                self.barcodes_table.setItem(row, 2, QTableWidgetItem(barcode.barcode_type or "EAN-13"))
-                
-                item_name = "-"
-                if barcode.product_id and barcode.product:
-                    item_name = barcode.product.name
-                elif barcode.ingredient_id and barcode.ingredient:
-                    item_name = barcode.ingredient.name
-                self.barcodes_table.setItem(row, 3, QTableWidgetItem(item_name))
-                
-                status_item = QTableWidgetItem("Active" if barcode.is_active else "Inactive")
-                if not barcode.is_active:
-                    status_item.setForeground(QColor("#8FA2BF"))
-                self.barcodes_table.setItem(row, 4, status_item)
+            def fetch_page(offset, limit):
+                return self.db.execute(stmt.offset(offset).limit(limit)).all()
             
-            db.close()
+            with batch_table_updates(self.barcodes_table):
+                self.barcodes_model.reset_query(fetch_page, total_count)
+                self.barcodes_table.resizeColumnsToContents()
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error loading barcodes: {e}")
             QMessageBox.critical(self, "Error", f"Failed to load barcodes: {str(e)}")
     
     def handle_add_barcode(self):
         """Handle add barcode"""
-        dialog = AddBarcodeDialog(self.user_id, self)
+        dialog = AddBarcodeDialog(self.user_id, self, db=self.db)
         if dialog.exec():
             self.load_barcodes()
+    
+    def closeEvent(self, event):
+        """Release the view's database session"""
+        self.db.close()
+        super().closeEvent(event)
 
 
 class AddBarcodeDialog(QDialog):
     """Dialog for adding barcode"""
     
-    def __init__(self, user_id: int, parent=None):
+    def __init__(self, user_id: int, parent=None, *, db=None):
         super().__init__(parent)
         self.user_id = user_id
+        # Share the caller's session when given; otherwise own one until done()
+        self._owns_db = db is None
+        self.db = db if db is not None else get_db_session()
         self.setWindowTitle("Add Barcode")
         self.setMinimumSize(450, 300)
+        self._items = {}
+        self.load_item_choices()
         self.setup_ui()
     
     def setup_ui(self):
@@ -198,38 +345,28 @@ class AddBarcodeDialog(QDialog):
         buttons_layout.addWidget(cancel_btn)
         
         save_btn = QPushButton("Save")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: 600;
-            }
-        """)
+        save_btn.setStyleSheet(BARCODE_SAVE_BUTTON_STYLE)
         save_btn.clicked.connect(self.handle_save)
         buttons_layout.addWidget(save_btn)
         
         layout.addLayout(buttons_layout)
     
+    def load_item_choices(self):
+        """Fetch product and ingredient (id, name) pairs once for the item combo"""
+        self.db.expire_all()
+        self._items = {
+            "Product": self.db.query(Product.product_id, Product.name).all(),
+            "Ingredient": self.db.query(Ingredient.ingredient_id, Ingredient.name).all(),
+        }
+    
     def load_items(self):
         """Load items based on type"""
         self.item_combo.clear()
         item_type = self.item_type_combo.currentText()
         
-        db = get_db_session()
-        try:
-            if item_type == "Product":
-                products = db.query(Product).all()
-                for product in products:
-                    self.item_combo.addItem(product.name, product.product_id)
-            else:  # Ingredient
-                ingredients = db.query(Ingredient).all()
-                for ingredient in ingredients:
-                    self.item_combo.addItem(ingredient.name, ingredient.ingredient_id)
-        finally:
-            db.close()
+        # Switching type only swaps in the cached list
+        for item_id, name in self._items.get(item_type, []):
+            self.item_combo.addItem(name, item_id)
     
     def handle_save(self):
         """Save barcode"""
@@ -244,25 +381,43 @@ class AddBarcodeDialog(QDialog):
                 QMessageBox.warning(self, "Validation Error", "Please select an item")
                 return
             
-            db = get_db_session()
+            # Indexed EXISTS lookup on the unique barcode_value instead of
+            # letting the INSERT fail and roll back
+            already_used = self.db.query(
+                self.db.query(Barcode).filter(
+                    Barcode.barcode_value == barcode_value
+                ).exists()
+            ).scalar()
+            if already_used:
+                QMessageBox.warning(self, "Validation Error", f"Barcode '{barcode_value}' already exists")
+                return
             
             item_type = self.item_type_combo.currentText()
-            barcode = Barcode(
+            # Single-row Core INSERT; no ORM object or unit-of-work needed
+            self.db.execute(insert(Barcode).values(
                 barcode_value=barcode_value,
                 barcode_type=self.barcode_type_combo.currentText(),
                 product_id=item_id if item_type == "Product" else None,
                 ingredient_id=item_id if item_type == "Ingredient" else None,
                 is_active=True
-            )
-            
-            db.add(barcode)
-            db.commit()
-            db.close()
+            ))
+            self.db.commit()
             
             QMessageBox.information(self, "Success", "Barcode added successfully")
             self.accept()
             
+        except IntegrityError:
+            # Inserted elsewhere between the check and our INSERT
+            self.db.rollback()
+            QMessageBox.warning(self, "Validation Error", f"Barcode '{barcode_value}' already exists")
         except Exception as e:
+            self.db.rollback()
             logger.error(f"Error saving barcode: {e}")
             QMessageBox.critical(self, "Error", f"Failed to save barcode: {str(e)}")
+    
+    def done(self, result):
+        """Close the dialog's own session, if it opened one"""
+        if self._owns_db:
+            self.db.close()
+        super().done(result)
 
@@ -4,23 +4,76 @@ Cloud Sync Management View
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QLineEdit, QFormLayout, QGroupBox, QMessageBox, QTextEdit
+    QLineEdit, QFormLayout, QGroupBox, QMessageBox, QPlainTextEdit
 )
+from PyQt6.QtCore import QTimer
 from loguru import logger
+from src.utils.background_tasks import run_in_background
 from src.utils.cloud_sync import get_cloud_sync_manager
 from src.database.connection import get_db_session
 from src.database.models import Location
 
 
+# Stylesheets; the group and button styles are shared by several widgets
+SYNC_TITLE_STYLE = """
+    color: #162640;
+    font-size: 24px;
+    font-weight: 700;
+"""
+
+SYNC_GROUP_STYLE = """
+    QGroupBox {
+        font-size: 16px;
+        font-weight: 600;
+        border: 2px solid #C8D4E8;
+        border-radius: 8px;
+        margin-top: 12px;
+        padding-top: 12px;
+    }
+"""
+
+SYNC_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #2F7DFF;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 10px 20px;
+    }
+"""
+
+SYNC_ACCENT_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #14B8A6;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 10px 20px;
+        font-weight: 600;
+    }
+"""
+
+SYNC_STATUS_LOG_STYLE = """
+    background-color: #F9FAFB;
+    border: 1px solid #C8D4E8;
+    border-radius: 6px;
+    font-family: monospace;
+    font-size: 12px;
+"""
+
+
 class CloudSyncView(QWidget):
     """Cloud Sync Management View"""
     
+    STATUS_LOG_MAX_LINES = 500
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
         self.sync_manager = get_cloud_sync_manager()
+        self._sync_running = False
         self.setup_ui()
-        self.load_config()
+        QTimer.singleShot(0, self.load_config)
     
     def setup_ui(self):
         """Setup cloud sync UI"""
@@ -32,11 +85,7 @@ class CloudSyncView(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("Cloud Sync Configuration")
-        title.setStyleSheet("""
-            color: #162640;
-            font-size: 24px;
-            font-weight: 700;
-        """)
+        title.setStyleSheet(SYNC_TITLE_STYLE)
         header_layout.addWidget(title)
         header_layout.addStretch()
         
@@ -45,16 +94,7 @@ class CloudSyncView(QWidget):
         
         # Configuration group
         config_group = QGroupBox("Sync Server Configuration")
-        config_group.setStyleSheet("""
-            QGroupBox {
-                font-size: 16px;
-                font-weight: 600;
-                border: 2px solid #C8D4E8;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 12px;
-            }
-        """)
+        config_group.setStyleSheet(SYNC_GROUP_STYLE)
         config_layout = QFormLayout(config_group)
         
         self.server_url_input = QLineEdit()
@@ -75,86 +115,45 @@ class CloudSyncView(QWidget):
         
         # Sync actions
         actions_group = QGroupBox("Sync Actions")
-        actions_group.setStyleSheet("""
-            QGroupBox {
-                font-size: 16px;
-                font-weight: 600;
-                border: 2px solid #C8D4E8;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 12px;
-            }
-        """)
+        actions_group.setStyleSheet(SYNC_GROUP_STYLE)
         actions_layout = QVBoxLayout(actions_group)
         
         sync_buttons_layout = QHBoxLayout()
         
         sync_orders_btn = QPushButton("Sync Orders")
-        sync_orders_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-            }
-        """)
+        sync_orders_btn.setStyleSheet(SYNC_BUTTON_STYLE)
         sync_orders_btn.clicked.connect(self.handle_sync_orders)
         sync_buttons_layout.addWidget(sync_orders_btn)
         
         sync_inventory_btn = QPushButton("Sync Inventory")
-        sync_inventory_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-            }
-        """)
+        sync_inventory_btn.setStyleSheet(SYNC_BUTTON_STYLE)
         sync_inventory_btn.clicked.connect(self.handle_sync_inventory)
         sync_buttons_layout.addWidget(sync_inventory_btn)
         
         sync_products_btn = QPushButton("Sync Products")
-        sync_products_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-            }
-        """)
+        sync_products_btn.setStyleSheet(SYNC_BUTTON_STYLE)
         sync_products_btn.clicked.connect(self.handle_sync_products)
         sync_buttons_layout.addWidget(sync_products_btn)
         
         full_sync_btn = QPushButton("Full Sync")
-        full_sync_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #14B8A6;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-weight: 600;
-            }
-        """)
+        full_sync_btn.setStyleSheet(SYNC_ACCENT_BUTTON_STYLE)
         full_sync_btn.clicked.connect(self.handle_full_sync)
         sync_buttons_layout.addWidget(full_sync_btn)
         
+        self.sync_buttons = [
+            sync_orders_btn, sync_inventory_btn, sync_products_btn, full_sync_btn
+        ]
+        
         actions_layout.addLayout(sync_buttons_layout)
         
         # Status display
-        self.status_text = QTextEdit()
+        # Plain-text log capped to the most recent lines; the oldest are
+        # dropped as new ones arrive
+        self.status_text = QPlainTextEdit()
         self.status_text.setReadOnly(True)
+        self.status_text.setMaximumBlockCount(self.STATUS_LOG_MAX_LINES)
         self.status_text.setMaximumHeight(150)
-        self.status_text.setStyleSheet("""
-            background-color: #F9FAFB;
-            border: 1px solid #C8D4E8;
-            border-radius: 6px;
-            font-family: monospace;
-            font-size: 12px;
-        """)
+        self.status_text.setStyleSheet(SYNC_STATUS_LOG_STYLE)
         actions_layout.addWidget(self.status_text)
         
         layout.addWidget(actions_group)
@@ -165,16 +164,7 @@ class CloudSyncView(QWidget):
         save_layout.addStretch()
         
         save_btn = QPushButton("Save Configuration")
-        save_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #14B8A6;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-weight: 600;
-            }
-        """)
+        save_btn.setStyleSheet(SYNC_ACCENT_BUTTON_STYLE)
         save_btn.clicked.connect(self.handle_save_config)
         save_layout.addWidget(save_btn)
         
@@ -215,41 +205,58 @@ class CloudSyncView(QWidget):
     
     def handle_sync_orders(self):
         """Handle sync orders"""
-        self.log_status("Syncing orders...")
-        result = self.sync_manager.sync_orders()
-        if result['success']:
-            self.log_status(f"✓ {result['message']}")
-            QMessageBox.information(self, "Success", result['message'])
-        else:
-            self.log_status(f"✗ {result['message']}")
-            QMessageBox.warning(self, "Error", result['message'])
+        self.start_sync(self.sync_manager.sync_orders, "Syncing orders...")
     
     def handle_sync_inventory(self):
         """Handle sync inventory"""
-        self.log_status("Syncing inventory...")
-        result = self.sync_manager.sync_inventory()
-        if result['success']:
-            self.log_status(f"✓ {result['message']}")
-            QMessageBox.information(self, "Success", result['message'])
-        else:
-            self.log_status(f"✗ {result['message']}")
-            QMessageBox.warning(self, "Error", result['message'])
+        self.start_sync(self.sync_manager.sync_inventory, "Syncing inventory...")
     
     def handle_sync_products(self):
         """Handle sync products"""
-        self.log_status("Syncing products...")
-        result = self.sync_manager.sync_products()
-        if result['success']:
-            self.log_status(f"✓ {result['message']}")
-            QMessageBox.information(self, "Success", result['message'])
-        else:
-            self.log_status(f"✗ {result['message']}")
-            QMessageBox.warning(self, "Error", result['message'])
+        self.start_sync(self.sync_manager.sync_products, "Syncing products...")
     
     def handle_full_sync(self):
         """Handle full sync"""
-        self.log_status("Starting full sync...")
-        result = self.sync_manager.full_sync()
+        # full_sync runs the three areas one after another in this one task
+        self.start_sync(self.sync_manager.full_sync, "Starting full sync...")
+    
+    def start_sync(self, job, status: str):
+        """
+        Run a sync job on the thread pool, keeping the window responsive
+        
+        Args:
+            job: Sync callable returning a result dict
+            status: Message logged when the sync starts
+        """
+        if self._sync_running:
+            return
+        
+        self.log_status(status)
+        self._sync_running = True
+        self.set_sync_buttons_enabled(False)
+        run_in_background(
+            job,
+            on_finished=self._on_sync_finished,
+            on_failed=self._on_sync_failed,
+        )
+    
+    def _on_sync_finished(self, result: dict):
+        """Report a finished sync job"""
+        self._sync_running = False
+        self.set_sync_buttons_enabled(True)
+        self.show_sync_result(result)
+    
+    def _on_sync_failed(self, error: str):
+        """Report a sync job that raised"""
+        self._on_sync_finished({'success': False, 'message': error})
+    
+    def set_sync_buttons_enabled(self, enabled: bool):
+        """Enable or disable the sync buttons"""
+        for button in self.sync_buttons:
+            button.setEnabled(enabled)
+    
+    def show_sync_result(self, result: dict):
+        """Log and report a sync result"""
         if result['success']:
             self.log_status(f"✓ {result['message']}")
             QMessageBox.information(self, "Success", result['message'])
@@ -261,5 +268,5 @@ class CloudSyncView(QWidget):
         """Log status message"""
         from datetime import datetime
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.status_text.append(f"[{timestamp}] {message}")
+        self.status_text.appendPlainText(f"[{timestamp}] {message}")
 
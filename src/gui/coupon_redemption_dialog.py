@@ -6,22 +6,179 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QFormLayout, QMessageBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, QRegularExpression
+from PyQt6.QtGui import QRegularExpressionValidator
 from loguru import logger
 from datetime import date
-from src.database.connection import get_db_session
+from functools import lru_cache
+from sqlalchemy import or_
+from src.database.connection import get_background_session, get_db_session
 from src.database.models import Coupon
+from src.utils.background_tasks import run_in_background
 from src.utils.notification_center import NotificationCenter
 
 
+# Characters a coupon code may contain, up to the coupon_code column length.
+# Used as a line-edit validator so anything else is refused by Qt before a
+# textChanged (and a lookup) ever happens.
+COUPON_CODE_PATTERN = r"[A-Za-z0-9_\-]{0,50}"
+
+
+def _fetch_coupon(code: str, *, db=None):
+    """
+    Look up an active coupon by code (safe to run on a pool thread)
+    
+    Args:
+        code: Normalized (upper-case) coupon code
+        db: Session to query with. If omitted, a background session is
+            opened (and closed) on its own connection, so a lookup on a
+            pool thread can't roll back the GUI's pending redemption
+    
+    Returns:
+        (code, row) where row holds the coupon's plain column values, or None
+    """
+    owns_db = db is None
+    if owns_db:
+        db = get_background_session()
+    try:
+        row = db.query(
+            Coupon.coupon_id,
+            Coupon.coupon_code,
+            Coupon.coupon_name,
+            Coupon.discount_type,
+            Coupon.discount_value,
+            Coupon.min_purchase_amount,
+            Coupon.max_discount_amount,
+            Coupon.usage_limit,
+            Coupon.usage_count,
+            Coupon.start_date,
+            Coupon.end_date,
+        ).filter(
+            Coupon.coupon_code == code,
+            Coupon.is_active == True
+        ).first()
+        return code, row
+    finally:
+        if owns_db:
+            db.close()
+
+
+@lru_cache(maxsize=256)
+def _evaluate_coupon(coupon, order_total: float, today: date):
+    """
+    Check a looked-up coupon against an order and work out its discount
+    
+    Args:
+        coupon: Row from _fetch_coupon. Rows are hashable and include
+            usage_count, so a redeemed coupon gets a fresh cache entry
+        order_total: Order total the discount applies to
+        today: Date the coupon's validity window is checked against
+    
+    Returns:
+        (ok, message, discount); message explains the result
+    """
+    if coupon.start_date > today:
+        return False, f"Coupon not yet valid (starts {coupon.start_date})", 0.0
+    
+    if coupon.end_date and coupon.end_date < today:
+        return False, f"Coupon expired (ended {coupon.end_date})", 0.0
+    
+    if coupon.usage_limit and coupon.usage_count >= coupon.usage_limit:
+        return False, "Coupon usage limit reached", 0.0
+    
+    if coupon.min_purchase_amount and order_total < coupon.min_purchase_amount:
+        return False, f"Minimum purchase of ${coupon.min_purchase_amount:.2f} required", 0.0
+    
+    discount_text = f"{coupon.discount_value}%"
+    if coupon.discount_type == "fixed":
+        discount_text = f"${coupon.discount_value:.2f}"
+    
+    if coupon.discount_type == "percentage":
+        discount = (order_total * coupon.discount_value) / 100.0
+        if coupon.max_discount_amount:
+            discount = min(discount, coupon.max_discount_amount)
+    else:
+        discount = min(coupon.discount_value, order_total)
+    
+    return True, f"{coupon.coupon_name} - {discount_text} off", discount
+
+
 class CouponRedemptionDialog(QDialog):
     """Dialog for applying coupon codes to orders"""
     
+    VALIDATE_DEBOUNCE_MS = 250
+    
+    # Stylesheets are built once; the info label switches between the
+    # neutral, error and success styles
+    _STYLE_TOTAL = """
+        color: #162640;
+        font-size: 16px;
+        font-weight: 600;
+        padding: 12px;
+        background-color: #F9FAFB;
+        border-radius: 6px;
+    """
+    
+    _STYLE_NEUTRAL = """
+        color: #5D6F8B;
+        font-size: 14px;
+        padding: 8px;
+        background-color: #EDF3FC;
+        border-radius: 4px;
+    """
+    
+    _STYLE_ERROR = """
+        color: #D92D20;
+        font-size: 14px;
+        padding: 8px;
+        background-color: #FFE9E8;
+        border-radius: 4px;
+    """
+    
+    _STYLE_SUCCESS = """
+        color: #059669;
+        font-size: 14px;
+        padding: 8px;
+        background-color: #D1FAE5;
+        border-radius: 4px;
+    """
+    
+    _STYLE_DISCOUNT = """
+        color: #14B8A6;
+        font-size: 16px;
+        font-weight: 600;
+    """
+    
+    _STYLE_APPLY_BUTTON = """
+        QPushButton {
+            background-color: #2F7DFF;
+            color: white;
+            border: none;
+            border-radius: 6px;
+            padding: 8px 16px;
+            font-weight: 600;
+        }
+        QPushButton:hover {
+            background-color: #1D66EA;
+        }
+        QPushButton:disabled {
+            background-color: #C8D4E8;
+            color: #8FA2BF;
+        }
+    """
+    
     def __init__(self, order_total: float, parent=None):
         super().__init__(parent)
         self.order_total = order_total
         self.applied_coupon = None
         self.discount_amount = 0.0
+        # Lookups by normalized code (None = not found); shared by
+        # validation and apply so each distinct code is queried once
+        self._coupon_cache = {}
+        # Entered code, stripped and upper-cased (kept by validate_coupon)
+        self._normalized_code = ""
+        # One session for the dialog's lifetime, closed in done()
+        self.db = get_db_session()
         self.setWindowTitle("Apply Coupon")
         self.setModal(True)
         self.setMinimumWidth(400)
@@ -35,14 +192,7 @@ class CouponRedemptionDialog(QDialog):
         
         # Order total
         total_label = QLabel(f"Order Total: ${self.order_total:.2f}")
-        total_label.setStyleSheet("""
-            color: #162640;
-            font-size: 16px;
-            font-weight: 600;
-            padding: 12px;
-            background-color: #F9FAFB;
-            border-radius: 6px;
-        """)
+        total_label.setStyleSheet(self._STYLE_TOTAL)
         layout.addWidget(total_label)
         
         form_layout = QFormLayout()
@@ -51,29 +201,29 @@ class CouponRedemptionDialog(QDialog):
         # Coupon code input
         self.coupon_code_input = QLineEdit()
         self.coupon_code_input.setPlaceholderText("Enter coupon code")
+        self.coupon_code_input.setValidator(
+            QRegularExpressionValidator(QRegularExpression(COUPON_CODE_PATTERN), self)
+        )
         self.coupon_code_input.textChanged.connect(self.validate_coupon)
+        
+        # Look the code up once typing pauses, not on every keystroke
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(self.VALIDATE_DEBOUNCE_MS)
+        self._validate_timer.timeout.connect(self._do_validate_coupon)
         form_layout.addRow("Coupon Code:", self.coupon_code_input)
         
         # Coupon info display
         self.coupon_info_label = QLabel()
-        self.coupon_info_label.setStyleSheet("""
-            color: #5D6F8B;
-            font-size: 14px;
-            padding: 8px;
-            background-color: #EDF3FC;
-            border-radius: 4px;
-        """)
+        self.coupon_info_label.setStyleSheet(self._STYLE_NEUTRAL)
+        self._current_info_style = self._STYLE_NEUTRAL
         self.coupon_info_label.setWordWrap(True)
         self.coupon_info_label.setVisible(False)
         form_layout.addRow("", self.coupon_info_label)
         
         # Discount preview
         self.discount_preview_label = QLabel()
-        self.discount_preview_label.setStyleSheet("""
-            color: #14B8A6;
-            font-size: 16px;
-            font-weight: 600;
-        """)
+        self.discount_preview_label.setStyleSheet(self._STYLE_DISCOUNT)
         self.discount_preview_label.setVisible(False)
         form_layout.addRow("Discount:", self.discount_preview_label)
         
@@ -89,142 +239,73 @@ class CouponRedemptionDialog(QDialog):
         
         self.apply_btn = QPushButton("Apply Coupon")
         self.apply_btn.setEnabled(False)
-        self.apply_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #1D66EA;
-            }
-            QPushButton:disabled {
-                background-color: #C8D4E8;
-                color: #8FA2BF;
-            }
-        """)
+        self.apply_btn.setStyleSheet(self._STYLE_APPLY_BUTTON)
         self.apply_btn.clicked.connect(self.apply_coupon)
         buttons_layout.addWidget(self.apply_btn)
         
         layout.addLayout(buttons_layout)
     
-    def validate_coupon(self):
+    def validate_coupon(self, text: str):
         """Validate coupon code as user types"""
-        code = self.coupon_code_input.text().strip().upper()
+        # Normalized once per edit; the lookup and apply read it from here
+        self._normalized_code = text.strip().upper()
         
-        if not code:
+        # Until the lookup runs, the preview belongs to the previous code
+        self.apply_btn.setEnabled(False)
+        
+        if not self._normalized_code:
+            self._validate_timer.stop()
             self.coupon_info_label.setVisible(False)
             self.discount_preview_label.setVisible(False)
-            self.apply_btn.setEnabled(False)
             return
         
-        db = get_db_session()
+        self._validate_timer.start()
+    
+    def _do_validate_coupon(self):
+        """Look up and check the entered coupon code"""
+        code = self._normalized_code
+        if not code:
+            return
+        
+        if code in self._coupon_cache:
+            self.show_coupon_validation(self._coupon_cache[code])
+            return
+        
+        # Query off the GUI thread; the result comes back via a signal
+        run_in_background(
+            _fetch_coupon,
+            code,
+            on_finished=self._on_coupon_fetched,
+            on_failed=self._on_coupon_fetch_failed,
+        )
+    
+    def _on_coupon_fetched(self, result):
+        """Cache a looked-up coupon and show it if its code is still entered"""
+        code, coupon = result
+        self._coupon_cache[code] = coupon
+        if code != self._normalized_code:
+            # The user kept typing; a newer lookup is on its way
+            return
+        self.show_coupon_validation(coupon)
+    
+    def _on_coupon_fetch_failed(self, error: str):
+        """Report a failed background coupon lookup"""
+        self._show_coupon_invalid("❌ Error validating coupon")
+    
+    def show_coupon_validation(self, coupon):
+        """Show whether a looked-up coupon applies to this order"""
         try:
-            coupon = db.query(Coupon).filter(
-                Coupon.coupon_code == code,
-                Coupon.is_active == True
-            ).first()
-            
             if not coupon:
-                self.coupon_info_label.setText("❌ Coupon code not found or inactive")
-                self.coupon_info_label.setStyleSheet("""
-                    color: #D92D20;
-                    font-size: 14px;
-                    padding: 8px;
-                    background-color: #FFE9E8;
-                    border-radius: 4px;
-                """)
-                self.coupon_info_label.setVisible(True)
-                self.discount_preview_label.setVisible(False)
-                self.apply_btn.setEnabled(False)
+                self._show_coupon_invalid("❌ Coupon code not found or inactive")
                 return
             
-            # Check date validity
-            today = date.today()
-            if coupon.start_date > today:
-                self.coupon_info_label.setText(f"❌ Coupon not yet valid (starts {coupon.start_date})")
-                self.coupon_info_label.setStyleSheet("""
-                    color: #D92D20;
-                    font-size: 14px;
-                    padding: 8px;
-                    background-color: #FFE9E8;
-                    border-radius: 4px;
-                """)
-                self.coupon_info_label.setVisible(True)
-                self.discount_preview_label.setVisible(False)
-                self.apply_btn.setEnabled(False)
+            ok, message, discount = _evaluate_coupon(coupon, self.order_total, date.today())
+            if not ok:
+                self._show_coupon_invalid(f"❌ {message}")
                 return
             
-            if coupon.end_date and coupon.end_date < today:
-                self.coupon_info_label.setText(f"❌ Coupon expired (ended {coupon.end_date})")
-                self.coupon_info_label.setStyleSheet("""
-                    color: #D92D20;
-                    font-size: 14px;
-                    padding: 8px;
-                    background-color: #FFE9E8;
-                    border-radius: 4px;
-                """)
-                self.coupon_info_label.setVisible(True)
-                self.discount_preview_label.setVisible(False)
-                self.apply_btn.setEnabled(False)
-                return
-            
-            # Check usage limit
-            if coupon.usage_limit and coupon.usage_count >= coupon.usage_limit:
-                self.coupon_info_label.setText("❌ Coupon usage limit reached")
-                self.coupon_info_label.setStyleSheet("""
-                    color: #D92D20;
-                    font-size: 14px;
-                    padding: 8px;
-                    background-color: #FFE9E8;
-                    border-radius: 4px;
-                """)
-                self.coupon_info_label.setVisible(True)
-                self.discount_preview_label.setVisible(False)
-                self.apply_btn.setEnabled(False)
-                return
-            
-            # Check minimum purchase
-            if coupon.min_purchase_amount and self.order_total < coupon.min_purchase_amount:
-                self.coupon_info_label.setText(
-                    f"❌ Minimum purchase of ${coupon.min_purchase_amount:.2f} required"
-                )
-                self.coupon_info_label.setStyleSheet("""
-                    color: #D92D20;
-                    font-size: 14px;
-                    padding: 8px;
-                    background-color: #FFE9E8;
-                    border-radius: 4px;
-                """)
-                self.coupon_info_label.setVisible(True)
-                self.discount_preview_label.setVisible(False)
-                self.apply_btn.setEnabled(False)
-                return
-            
-            # Valid coupon - show info
-            discount_text = f"{coupon.discount_value}%"
-            if coupon.discount_type == "fixed":
-                discount_text = f"${coupon.discount_value:.2f}"
-            
-            # Calculate discount
-            if coupon.discount_type == "percentage":
-                discount = (self.order_total * coupon.discount_value) / 100.0
-                if coupon.max_discount_amount:
-                    discount = min(discount, coupon.max_discount_amount)
-            else:
-                discount = min(coupon.discount_value, self.order_total)
-            
-            self.coupon_info_label.setText(f"✅ {coupon.coupon_name} - {discount_text} off")
-            self.coupon_info_label.setStyleSheet("""
-                color: #059669;
-                font-size: 14px;
-                padding: 8px;
-                background-color: #D1FAE5;
-                border-radius: 4px;
-            """)
+            self.coupon_info_label.setText(f"✅ {message}")
+            self._set_info_style(self._STYLE_SUCCESS)
             self.coupon_info_label.setVisible(True)
             
             self.discount_preview_label.setText(f"-${discount:.2f}")
@@ -233,49 +314,70 @@ class CouponRedemptionDialog(QDialog):
             
         except Exception as e:
             logger.error(f"Error validating coupon: {e}")
-            self.coupon_info_label.setText("❌ Error validating coupon")
-            self.coupon_info_label.setStyleSheet("""
-                color: #D92D20;
-                font-size: 14px;
-                padding: 8px;
-                background-color: #FFE9E8;
-                border-radius: 4px;
-            """)
-            self.coupon_info_label.setVisible(True)
-            self.apply_btn.setEnabled(False)
-        finally:
-            db.close()
+            self._show_coupon_invalid("❌ Error validating coupon")
+    
+    def _show_coupon_invalid(self, message: str):
+        """Show why the entered code can't be applied"""
+        self.coupon_info_label.setText(message)
+        self._set_info_style(self._STYLE_ERROR)
+        self.coupon_info_label.setVisible(True)
+        self.discount_preview_label.setVisible(False)
+        self.apply_btn.setEnabled(False)
+    
+    def _set_info_style(self, style: str):
+        """Restyle the info label only when its state actually changes"""
+        if style is not self._current_info_style:
+            self.coupon_info_label.setStyleSheet(style)
+            self._current_info_style = style
+    
+    def _lookup_coupon(self, code: str):
+        """Get the active coupon for a normalized code, caching the result"""
+        if code not in self._coupon_cache:
+            self._coupon_cache[code] = _fetch_coupon(code, db=self.db)[1]
+        return self._coupon_cache[code]
     
     def apply_coupon(self):
         """Apply the coupon"""
-        code = self.coupon_code_input.text().strip().upper()
+        code = self._normalized_code
         
-        db = get_db_session()
+        db = self.db
         try:
-            coupon = db.query(Coupon).filter(
-                Coupon.coupon_code == code,
-                Coupon.is_active == True
-            ).first()
-            
+            coupon = self._lookup_coupon(code)
             if not coupon:
                 QMessageBox.warning(self, "Invalid Coupon", "Coupon code not found")
                 return
             
-            # Calculate discount
-            if coupon.discount_type == "percentage":
-                discount = (self.order_total * coupon.discount_value) / 100.0
-                if coupon.max_discount_amount:
-                    discount = min(discount, coupon.max_discount_amount)
-            else:
-                discount = min(coupon.discount_value, self.order_total)
+            ok, message, discount = _evaluate_coupon(coupon, self.order_total, date.today())
+            if not ok:
+                QMessageBox.warning(self, "Invalid Coupon", message)
+                return
+            
+            # Claim one use in a single conditional UPDATE: the usage limit
+            # is checked by the database against the current count, so two
+            # redemptions racing for the last use can't both succeed
+            updated = db.query(Coupon).filter(
+                Coupon.coupon_id == coupon.coupon_id,
+                Coupon.is_active == True,
+                or_(
+                    Coupon.usage_limit == None,
+                    Coupon.usage_count < Coupon.usage_limit
+                )
+            ).update(
+                {Coupon.usage_count: Coupon.usage_count + 1},
+                synchronize_session=False
+            )
+            if not updated:
+                db.rollback()
+                # The cached row is stale; look it up again on the next check
+                self._coupon_cache.pop(code, None)
+                QMessageBox.warning(self, "Invalid Coupon", "Coupon is no longer available")
+                return
+            db.commit()
+            self._coupon_cache.pop(code, None)
             
             self.applied_coupon = coupon
             self.discount_amount = discount
             
-            # Increment usage count
-            coupon.usage_count += 1
-            db.commit()
-            
             logger.info(f"Coupon {code} applied: ${discount:.2f} discount")
             
             NotificationCenter.instance().emit_notification(
@@ -297,8 +399,11 @@ class CouponRedemptionDialog(QDialog):
             logger.error(f"Error applying coupon: {e}")
             db.rollback()
             QMessageBox.critical(self, "Error", f"Failed to apply coupon:\n{str(e)}")
-        finally:
-            db.close()
+    
+    def done(self, result):
+        """Close the dialog's session however the dialog is dismissed"""
+        self.db.close()
+        super().done(result)
     
     def get_coupon_info(self):
         """Get applied coupon information"""
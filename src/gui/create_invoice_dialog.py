@@ -5,16 +5,111 @@ Create Invoice Dialog - Create new invoices (sales or purchase)
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QLineEdit, QComboBox, QDoubleSpinBox, QFormLayout, QMessageBox,
-    QDateEdit, QTextEdit, QTableWidget, QTableWidgetItem, QHeaderView
+    QDateEdit, QTextEdit, QTableView, QHeaderView
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor, QStandardItem, QStandardItemModel
 from loguru import logger
 from datetime import date
+from uuid import uuid4
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from src.database.connection import get_db_session
-from src.database.models import Invoice, Customer, Supplier, Product
+from src.database.models import Invoice, InvoiceItem, Customer, Supplier, Product
 from src.gui.table_utils import enable_table_auto_resize
 
 
+TAX_RATE = Decimal("0.10")  # 10% tax (can be made configurable)
+CENT = Decimal("0.01")
+
+
+# Foreground of the Remove cell, built once rather than per data() call
+_REMOVE_FOREGROUND = QColor("#D92D20")
+
+
+def _to_money(value) -> Decimal:
+    """Convert a float amount to a Decimal rounded to cents"""
+    return Decimal(str(value)).quantize(CENT, ROUND_HALF_UP)
+
+
+class InvoiceItemsModel(QAbstractTableModel):
+    """
+    Table model over the dialog's invoice item dicts
+    
+    The view reads rows straight from the list, so adding or removing an
+    item is a single row notification rather than rebuilding cell items
+    and a Remove button per row. The last column shows "Remove"; clicking
+    it is handled by the dialog.
+    """
+    
+    HEADERS = ["Product", "Quantity", "Unit Price", "Total", "Actions"]
+    ACTIONS_COLUMN = 4
+    
+    def __init__(self, items: list, parent=None):
+        super().__init__(parent)
+        self._items = items
+        # Display text per row, formatted once when the item is added
+        # rather than on every data() call as rows are repainted
+        self._display = [self._format_item(item) for item in items]
+    
+    @staticmethod
+    def _format_item(item: dict) -> tuple:
+        """Cell texts for an item's data columns"""
+        return (
+            item.get('product_name', 'Unknown'),
+            str(item['quantity']),
+            f"${item['unit_price']:.2f}",
+            f"${item['total']:.2f}",
+        )
+    
+    def append_item(self, item: dict):
+        """Add an item as the last row"""
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(item)
+        self._display.append(self._format_item(item))
+        self.endInsertRows()
+    
+    def remove_item(self, row: int) -> dict:
+        """Remove and return the item at row"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        del self._display[row]
+        self.endRemoveRows()
+        return item
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.ACTIONS_COLUMN:
+                return "Remove"
+            return self._display[index.row()][column]
+        elif column == self.ACTIONS_COLUMN:
+            if role == Qt.ItemDataRole.ForegroundRole:
+                return _REMOVE_FOREGROUND
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return "Remove this item"
+        return None
+
+
 class CreateInvoiceDialog(QDialog):
     """Dialog for creating a new invoice"""
     
@@ -22,9 +117,21 @@ class CreateInvoiceDialog(QDialog):
         super().__init__(parent)
         self.user_id = user_id
         self.invoice_items = []  # List of {product_id, quantity, unit_price, total}
+        # Running totals in Decimal cents; handle_save reuses them
+        self._subtotal = Decimal("0.00")
+        self._tax = Decimal("0.00")
+        self._total = Decimal("0.00")
+        # Amounts currently on the total labels, which start at $0.00
+        self._shown_subtotal = self._shown_tax = self._shown_total = Decimal("0.00")
+        # (label, id) choices per invoice type, fetched once per dialog
+        self._customers = []
+        self._suppliers = []
+        # One session for the dialog's lifetime, closed in done()
+        self.db = get_db_session()
         self.setWindowTitle("Create Invoice")
         self.setModal(True)
         self.setMinimumSize(700, 600)
+        self.load_entity_choices()
         self.setup_ui()
     
     def setup_ui(self):
@@ -44,7 +151,6 @@ class CreateInvoiceDialog(QDialog):
         
         # Customer/Supplier selection
         self.entity_combo = QComboBox()
-        self.entity_combo.addItem("Select...", None)
         self.load_entities()
         form_layout.addRow("Customer/Supplier:", self.entity_combo)
         
@@ -77,14 +183,13 @@ class CreateInvoiceDialog(QDialog):
         layout.addWidget(items_label)
         
         # Items table
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(5)
-        self.items_table.setHorizontalHeaderLabels([
-            "Product", "Quantity", "Unit Price", "Total", "Actions"
-        ])
+        self.items_table = QTableView()
+        self.items_model = InvoiceItemsModel(self.invoice_items, self)
+        self.items_table.setModel(self.items_model)
+        self.items_table.clicked.connect(self._on_item_clicked)
         enable_table_auto_resize(self.items_table)
         self.items_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #C8D4E8;
                 border-radius: 8px;
             }
@@ -167,32 +272,49 @@ class CreateInvoiceDialog(QDialog):
         
         layout.addLayout(buttons_layout)
     
-    def load_entities(self):
-        """Load customers or suppliers based on invoice type"""
-        self.entity_combo.clear()
-        self.entity_combo.addItem("Select...", None)
-        
-        db = get_db_session()
+    def load_entity_choices(self):
+        """Fetch active customers and suppliers once for the entity combo"""
+        db = self.db
         try:
-            invoice_type = self.type_combo.currentText()
-            if invoice_type == "sales":
-                customers = db.query(Customer).filter(Customer.status == "active").all()
-                for customer in customers:
-                    self.entity_combo.addItem(
-                        f"{customer.first_name} {customer.last_name}",
-                        customer.customer_id
-                    )
-            else:  # purchase
-                suppliers = db.query(Supplier).filter(Supplier.status == "active").all()
-                for supplier in suppliers:
-                    self.entity_combo.addItem(
-                        supplier.name,
-                        supplier.supplier_id
-                    )
+            # Only the id and display columns; the combo never needs the
+            # rest of the row, so no ORM objects are built
+            customers = db.query(
+                Customer.customer_id, Customer.first_name, Customer.last_name
+            ).filter(Customer.status == "active").all()
+            self._customers = [
+                (f"{customer.first_name} {customer.last_name}", customer.customer_id)
+                for customer in customers
+            ]
+            suppliers = db.query(
+                Supplier.supplier_id, Supplier.name
+            ).filter(Supplier.status == "active").all()
+            self._suppliers = [
+                (supplier.name, supplier.supplier_id)
+                for supplier in suppliers
+            ]
         except Exception as e:
             logger.error(f"Error loading entities: {e}")
-        finally:
-            db.close()
+            db.rollback()
+    
+    def load_entities(self):
+        """Load customers or suppliers based on invoice type"""
+        # Switching type only swaps in the other prefetched list. The items
+        # are built off-screen and handed over as one model, rather than
+        # addItem() per entry each notifying the combo.
+        invoice_type = self.type_combo.currentText()
+        entities = self._customers if invoice_type == "sales" else self._suppliers
+        
+        model = QStandardItemModel(self.entity_combo)
+        placeholder = QStandardItem("Select...")
+        placeholder.setData(None, Qt.ItemDataRole.UserRole)
+        model.appendRow(placeholder)
+        for label, entity_id in entities:
+            item = QStandardItem(label)
+            item.setData(entity_id, Qt.ItemDataRole.UserRole)
+            model.appendRow(item)
+        
+        self.entity_combo.setModel(model)
+        self.entity_combo.setCurrentIndex(0)
     
     def update_type_dependent_fields(self):
         """Update fields when invoice type changes"""
@@ -204,51 +326,37 @@ class CreateInvoiceDialog(QDialog):
         dialog = AddInvoiceItemDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             item = dialog.get_item()
-            self.invoice_items.append(item)
-            self.update_items_table()
+            self.items_model.append_item(item)
+            self._subtotal += _to_money(item['total'])
             self.update_totals()
     
-    def update_items_table(self):
-        """Update the items table display"""
-        self.items_table.setRowCount(len(self.invoice_items))
-        
-        for row, item in enumerate(self.invoice_items):
-            product_name = item.get('product_name', 'Unknown')
-            self.items_table.setItem(row, 0, QTableWidgetItem(product_name))
-            self.items_table.setItem(row, 1, QTableWidgetItem(str(item['quantity'])))
-            self.items_table.setItem(row, 2, QTableWidgetItem(f"${item['unit_price']:.2f}"))
-            self.items_table.setItem(row, 3, QTableWidgetItem(f"${item['total']:.2f}"))
-            
-            # Remove button
-            remove_btn = QPushButton("Remove")
-            remove_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #D92D20;
-                    color: white;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px 8px;
-                }
-            """)
-            remove_btn.clicked.connect(lambda checked, r=row: self.remove_item(r))
-            self.items_table.setCellWidget(row, 4, remove_btn)
+    def _on_item_clicked(self, index):
+        """Remove the row whose Remove cell was clicked"""
+        if index.column() == InvoiceItemsModel.ACTIONS_COLUMN:
+            self.remove_item(index.row())
     
     def remove_item(self, row: int):
         """Remove item from invoice"""
         if 0 <= row < len(self.invoice_items):
-            self.invoice_items.pop(row)
-            self.update_items_table()
+            removed = self.items_model.remove_item(row)
+            self._subtotal -= _to_money(removed['total'])
             self.update_totals()
     
     def update_totals(self):
         """Update invoice totals"""
-        subtotal = sum(item['total'] for item in self.invoice_items)
-        tax = subtotal * 0.10  # 10% tax (can be made configurable)
-        total = subtotal + tax
+        self._tax = (self._subtotal * TAX_RATE).quantize(CENT, ROUND_HALF_UP)
+        self._total = self._subtotal + self._tax
         
-        self.subtotal_value.setText(f"${subtotal:.2f}")
-        self.tax_value.setText(f"${tax:.2f}")
-        self.total_value.setText(f"${total:.2f}")
+        # Only reformat and relabel the amounts that changed
+        if self._subtotal != self._shown_subtotal:
+            self.subtotal_value.setText(f"${self._subtotal:.2f}")
+            self._shown_subtotal = self._subtotal
+        if self._tax != self._shown_tax:
+            self.tax_value.setText(f"${self._tax:.2f}")
+            self._shown_tax = self._tax
+        if self._total != self._shown_total:
+            self.total_value.setText(f"${self._total:.2f}")
+            self._shown_total = self._total
     
     def handle_save(self):
         """Handle save button click"""
@@ -260,27 +368,17 @@ class CreateInvoiceDialog(QDialog):
         issue_date = self.issue_date.date().toPyDate()
         due_date = self.due_date.date().toPyDate()
         
-        # Calculate totals
-        subtotal = sum(item['total'] for item in self.invoice_items)
-        tax = subtotal * 0.10  # 10% tax
-        total = subtotal + tax
-        
-        # Generate invoice number if not provided
+        # Generate invoice number if not provided. The number is derived
+        # from the new row's invoice_id once it is flushed; until then the
+        # row holds a unique placeholder, never committed
         invoice_number = self.invoice_number_input.text().strip()
+        prefix = None
         if not invoice_number:
-            from datetime import datetime
             prefix = "INV" if invoice_type == "sales" else "PO"
-            invoice_number = f"{prefix}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+            invoice_number = f"{prefix}-PENDING-{uuid4().hex}"
         
-        db = get_db_session()
+        db = self.db
         try:
-            # Check if invoice number already exists
-            existing = db.query(Invoice).filter(Invoice.invoice_number == invoice_number).first()
-            if existing:
-                QMessageBox.warning(self, "Validation Error", 
-                    f"Invoice number '{invoice_number}' already exists.")
-                return
-            
             # Get entity IDs
             entity_id = self.entity_combo.currentData()
             customer_id = entity_id if invoice_type == "sales" else None
@@ -291,10 +389,10 @@ class CreateInvoiceDialog(QDialog):
                 customer_id=customer_id,
                 supplier_id=supplier_id,
                 invoice_type=invoice_type,
-                subtotal=subtotal,
-                tax_amount=tax,
+                subtotal=float(self._subtotal),
+                tax_amount=float(self._tax),
                 discount_amount=0.0,
-                total_amount=total,
+                total_amount=float(self._total),
                 currency="USD",
                 issue_date=issue_date,
                 due_date=due_date,
@@ -302,7 +400,23 @@ class CreateInvoiceDialog(QDialog):
                 notes=self.notes_input.toPlainText().strip() or None
             )
             
+            # Header and line items go in one transaction: flush to get the
+            # invoice_id, then insert every item in a single executemany
             db.add(new_invoice)
+            db.flush()
+            if prefix:
+                invoice_number = f"{prefix}-{new_invoice.invoice_id:08d}"
+                new_invoice.invoice_number = invoice_number
+            db.execute(insert(InvoiceItem), [
+                {
+                    'invoice_id': new_invoice.invoice_id,
+                    'product_id': item['product_id'],
+                    'quantity': item['quantity'],
+                    'unit_price': item['unit_price'],
+                    'total_price': item['total'],
+                }
+                for item in self.invoice_items
+            ])
             db.commit()
             
             logger.info(f"New invoice created: {invoice_number}")
@@ -310,10 +424,23 @@ class CreateInvoiceDialog(QDialog):
                 f"Invoice '{invoice_number}' created successfully!")
             self.accept()
             
+        except IntegrityError as e:
+            db.rollback()
+            if "invoice_number" not in str(e.orig):
+                # e.g. a line item whose product has since been deleted
+                logger.error(f"Error creating invoice: {e}")
+                QMessageBox.critical(self, "Error", f"Failed to create invoice:\n{str(e.orig)}")
+                return
+            # invoice_number is UNIQUE; the insert itself is the existence check
+            QMessageBox.warning(self, "Validation Error", 
+                f"Invoice number '{invoice_number}' already exists.")
         except Exception as e:
             logger.error(f"Error creating invoice: {e}")
             db.rollback()
             QMessageBox.critical(self, "Error", f"Failed to create invoice:\n{str(e)}")
-        finally:
-            db.close()
+    
+    def done(self, result):
+        """Close the dialog's session however the dialog is dismissed"""
+        self.db.close()
+        super().done(result)
 
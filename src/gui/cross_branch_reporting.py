@@ -4,22 +4,195 @@ Cross-Branch Reporting - Multi-location reporting and analytics
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QComboBox, QDateEdit, QMessageBox
+    QTableView, QComboBox, QDateEdit, QMessageBox
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 from loguru import logger
-from datetime import datetime
-from src.database.connection import get_db_session
+import numpy as np
+from datetime import datetime, timedelta
+from functools import lru_cache
+from sqlalchemy import func, select, true
+from src.database.connection import get_background_session, get_db_session
 from src.database.models import Location, Order, OrderItem, Product
+from src.utils.background_tasks import run_in_background
+
+
+# Growth % colours, built once rather than per data() call
+_GROWTH_UP_FOREGROUND = QColor("#14B8A6")
+_GROWTH_DOWN_FOREGROUND = QColor("#D92D20")
+
+# Bound once; data() calls these for every visible cell
+format_money = "${:,.2f}".format
+format_growth = "{:+.1f}%".format
+
+# One record per location; totals and ratios are computed over whole columns
+BRANCH_FIGURES_DTYPE = np.dtype([
+    ('sales', 'f8'),
+    ('orders', 'i8'),
+    ('avg_order', 'f8'),
+    ('growth', 'f8'),
+])
+
+
+class BranchReportModel(QAbstractTableModel):
+    """Table model over the per-location report rows"""
+    
+    HEADERS = ["Location", "Total Sales", "Orders", "Avg Order Value", "Top Product", "Growth %"]
+    GROWTH_COLUMN = 5
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._locations = []
+        self._figures = np.zeros(0, dtype=BRANCH_FIGURES_DTYPE)
+        self._top_product = ""
+    
+    def set_rows(self, locations: list, figures: np.ndarray, top_product: str):
+        """
+        Replace the rows in one model reset
+        
+        Args:
+            locations: Location name per row
+            figures: BRANCH_FIGURES_DTYPE array, one record per location
+            top_product: Best selling product shown on every row
+        """
+        self.beginResetModel()
+        self._locations = locations
+        self._figures = figures
+        self._top_product = top_product
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._locations)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        column = index.column()
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return self._locations[row]
+            if column == 4:
+                return self._top_product
+            figures = self._figures[row]
+            if column == 1:
+                return format_money(figures['sales'])
+            if column == 2:
+                return str(figures['orders'])
+            if column == 3:
+                return format_money(figures['avg_order'])
+            if column == self.GROWTH_COLUMN:
+                return format_growth(figures['growth'])
+        elif role == Qt.ItemDataRole.ForegroundRole and column == self.GROWTH_COLUMN:
+            growth = self._figures[row]['growth']
+            if growth > 0:
+                return _GROWTH_UP_FOREGROUND
+            if growth < 0:
+                return _GROWTH_DOWN_FOREGROUND
+        return None
+
+
+def _fetch_branch_sales(filter_key):
+    """
+    Query the sales figures for a report (runs on a pool thread)
+    
+    Results are cached per filter and per state of the order data, so
+    switching back to a recent range skips the queries but new or changed
+    orders are always picked up; Refresh also clears the cache.
+    
+    Args:
+        filter_key: (location_id, from_datetime, to_datetime)
+    
+    Returns:
+        (filter_key, sales, order_count, previous_sales, top_product) so
+        results can be matched to the request
+    """
+    with get_background_session() as db:
+        data_key = _order_data_key(db)
+    return _query_branch_sales(filter_key, data_key)
+
+
+def _order_data_key(db):
+    """Cheap fingerprint of the order data behind the report"""
+    # Counts catch deletes, which leave the latest modification alone
+    return tuple(db.execute(
+        select(
+            select(func.max(Order.last_modified)).scalar_subquery(),
+            select(func.count(Order.order_id)).scalar_subquery(),
+            select(func.max(OrderItem.last_modified)).scalar_subquery(),
+            select(func.count(OrderItem.order_item_id)).scalar_subquery()
+        )
+    ).one())
+
+
+@lru_cache(maxsize=32)
+def _query_branch_sales(filter_key, data_key):
+    """Sales figures for _fetch_branch_sales; data_key only keys the cache"""
+    _location_id, from_datetime, to_datetime = filter_key
+    # The previous period is the same length, ending just before this one
+    previous_to = from_datetime - timedelta(microseconds=1)
+    previous_from = previous_to - (to_datetime - from_datetime)
+    with get_background_session() as db:
+        # Orders don't record a location yet, so every location is
+        # credited with all orders in the range. Both periods are summed
+        # in SQL and come back side by side from one statement.
+        current = select(
+            func.coalesce(func.sum(Order.total_amount), 0.0).label("sales"),
+            func.count(Order.order_id).label("order_count")
+        ).where(
+            Order.order_datetime.between(from_datetime, to_datetime)
+        ).cte("current_period")
+        previous = select(
+            func.coalesce(func.sum(Order.total_amount), 0.0).label("sales")
+        ).where(
+            Order.order_datetime.between(previous_from, previous_to)
+        ).cte("previous_period")
+        sales, order_count, previous_sales = db.execute(
+            select(
+                current.c.sales,
+                current.c.order_count,
+                previous.c.sales
+            ).select_from(current.join(previous, true()))
+        ).one()
+        
+        # Get top product (the same for every location, see above):
+        # ranked by revenue in SQL, only the winning name comes back
+        top_product = db.execute(
+            select(Product.name)
+            .join(OrderItem, OrderItem.product_id == Product.product_id)
+            .join(Order, Order.order_id == OrderItem.order_id)
+            .where(
+                Order.order_datetime.between(from_datetime, to_datetime)
+            )
+            .group_by(Product.name)
+            .order_by(func.sum(OrderItem.total_price).desc())
+            .limit(1)
+        ).scalar() or "-"
+        
+        return filter_key, sales, order_count, previous_sales, top_product
 
 
 class CrossBranchReportingView(QWidget):
     """Cross-Branch Reporting View"""
     
+    FILTER_DEBOUNCE_MS = 250
+    
     def __init__(self, user_id: int, parent=None):
         super().__init__(parent)
         self.user_id = user_id
+        self._locations = {}  # location_id -> name of active locations
+        self._pending_filter_key = None
         self.setup_ui()
         self.load_locations()
         self.generate_report()
@@ -49,10 +222,17 @@ class CrossBranchReportingView(QWidget):
         filters_layout = QHBoxLayout()
         filters_layout.setSpacing(12)
         
+        # Coalesce bursts of filter changes (e.g. stepping through dates)
+        # into one report once they settle
+        self._report_timer = QTimer(self)
+        self._report_timer.setSingleShot(True)
+        self._report_timer.setInterval(self.FILTER_DEBOUNCE_MS)
+        self._report_timer.timeout.connect(self.generate_report)
+        
         filters_layout.addWidget(QLabel("Location:"))
         self.location_combo = QComboBox()
         self.location_combo.addItem("All Locations")
-        self.location_combo.currentTextChanged.connect(self.generate_report)
+        self.location_combo.currentTextChanged.connect(self._report_timer.start)
         filters_layout.addWidget(self.location_combo)
         
         filters_layout.addWidget(QLabel("From:"))
@@ -60,14 +240,14 @@ class CrossBranchReportingView(QWidget):
         today = QDate.currentDate()
         self.from_date.setDate(today.addDays(-30))
         self.from_date.setCalendarPopup(True)
-        self.from_date.dateChanged.connect(self.generate_report)
+        self.from_date.dateChanged.connect(self._report_timer.start)
         filters_layout.addWidget(self.from_date)
         
         filters_layout.addWidget(QLabel("To:"))
         self.to_date = QDateEdit()
         self.to_date.setDate(today)
         self.to_date.setCalendarPopup(True)
-        self.to_date.dateChanged.connect(self.generate_report)
+        self.to_date.dateChanged.connect(self._report_timer.start)
         filters_layout.addWidget(self.to_date)
         
         filters_layout.addStretch()
@@ -82,7 +262,7 @@ class CrossBranchReportingView(QWidget):
                 padding: 8px 16px;
             }
         """)
-        refresh_btn.clicked.connect(self.generate_report)
+        refresh_btn.clicked.connect(self.refresh_report)
         filters_layout.addWidget(refresh_btn)
         
         layout.addLayout(filters_layout)
@@ -108,13 +288,11 @@ class CrossBranchReportingView(QWidget):
         layout.addSpacing(24)
         
         # Report table
-        self.report_table = QTableWidget()
-        self.report_table.setColumnCount(6)
-        self.report_table.setHorizontalHeaderLabels([
-            "Location", "Total Sales", "Orders", "Avg Order Value", "Top Product", "Growth %"
-        ])
+        self.report_table = QTableView()
+        self.report_model = BranchReportModel(self)
+        self.report_table.setModel(self.report_model)
         self.report_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #C8D4E8;
                 border-radius: 8px;
                 gridline-color: #EDF3FC;
@@ -156,6 +334,7 @@ class CrossBranchReportingView(QWidget):
         layout.addWidget(title_label)
         
         value_label = QLabel(value)
+        value_label.setObjectName("summary_value")
         value_label.setStyleSheet("""
             color: #162640;
             font-size: 24px;
@@ -168,108 +347,100 @@ class CrossBranchReportingView(QWidget):
     def load_locations(self):
         """Load locations into combo box"""
         try:
-            db = get_db_session()
-            locations = db.query(Location).filter(Location.is_active == True).all()
+            with get_db_session() as db:
+                locations = db.query(
+                    Location.location_id, Location.name
+                ).filter(Location.is_active == True).all()
+            
+            # Kept for generate_report, which picks from these instead of
+            # querying the locations again on every filter change
+            self._locations = {
+                location.location_id: location.name for location in locations
+            }
             
             for location in locations:
                 self.location_combo.addItem(location.name, location.location_id)
-            
-            db.close()
         except Exception as e:
             logger.error(f"Error loading locations: {e}")
     
+    def refresh_report(self):
+        """Regenerate the report now, dropping any pending filter change"""
+        self._report_timer.stop()
+        _query_branch_sales.cache_clear()
+        self.generate_report()
+    
     def generate_report(self):
         """Generate cross-branch report"""
+        from_date = self.from_date.date().toPyDate()
+        to_date = self.to_date.date().toPyDate()
+        from_datetime = datetime.combine(from_date, datetime.min.time())
+        to_datetime = datetime.combine(to_date, datetime.max.time())
+        
+        # Get selected location
+        location_id = self.location_combo.currentData()
+        
+        # Query off the GUI thread; the newest request wins if several
+        # are in flight
+        filter_key = (location_id, from_datetime, to_datetime)
+        self._pending_filter_key = filter_key
+        run_in_background(
+            _fetch_branch_sales,
+            filter_key,
+            on_finished=self._on_report_loaded,
+            on_failed=self._on_report_failed,
+        )
+    
+    def _on_report_loaded(self, result):
+        """Show the figures fetched by _fetch_branch_sales"""
+        filter_key, location_sales, order_count, previous_sales, top_product = result
+        if filter_key != self._pending_filter_key:
+            # Superseded by a newer filter while this one was running
+            return
+        self._pending_filter_key = None
+        
         try:
-            from_date = self.from_date.date().toPyDate()
-            to_date = self.to_date.date().toPyDate()
-            from_datetime = datetime.combine(from_date, datetime.min.time())
-            to_datetime = datetime.combine(to_date, datetime.max.time())
-            
-            db = get_db_session()
-            
-            # Get selected location
-            location_id = self.location_combo.currentData()
+            location_id = filter_key[0]
             
             # Get all locations or selected one
             if location_id:
-                locations = db.query(Location).filter(Location.location_id == location_id).all()
+                location_names = [self._locations[location_id]]
             else:
-                locations = db.query(Location).filter(Location.is_active == True).all()
+                location_names = list(self._locations.values())
             
-            report_data = []
-            total_sales_all = 0.0
-            total_orders_all = 0
-            
-            for location in locations:
-                # Get orders for this location (simplified - would need location_id in Order model)
-                # For now, we'll use a placeholder approach
-                orders = db.query(Order).filter(
-                    Order.order_datetime >= from_datetime,
-                    Order.order_datetime <= to_datetime
-                ).all()
-                
-                location_orders = orders  # In real implementation, filter by location_id
-                location_sales = sum(order.total_amount for order in location_orders)
-                order_count = len(location_orders)
-                avg_order = location_sales / order_count if order_count > 0 else 0
-                
-                # Get top product for this location
-                top_product = "-"
-                if location_orders:
-                    product_sales = {}
-                    for order in location_orders:
-                        for item in order.order_items:
-                            if item.product:
-                                product_sales[item.product.name] = product_sales.get(item.product.name, 0) + item.total_price
-                    
-                    if product_sales:
-                        top_product = max(product_sales, key=product_sales.get)
-                
-                # Calculate growth (simplified - compare with previous period)
-                growth = 0.0  # Would calculate based on previous period
-                
-                report_data.append({
-                    'location': location.name,
-                    'sales': location_sales,
-                    'orders': order_count,
-                    'avg_order': avg_order,
-                    'top_product': top_product,
-                    'growth': growth
-                })
-                
-                total_sales_all += location_sales
-                total_orders_all += order_count
+            figures = np.zeros(len(location_names), dtype=BRANCH_FIGURES_DTYPE)
+            figures['sales'] = location_sales
+            figures['orders'] = order_count
+            sales = figures['sales']
+            orders = figures['orders']
+            figures['avg_order'] = np.divide(
+                sales, orders, out=np.zeros_like(sales), where=orders > 0
+            )
+            previous = np.full(len(location_names), previous_sales, dtype='f8')
+            np.divide(
+                (sales - previous) * 100, previous,
+                out=figures['growth'], where=previous > 0
+            )
             
             # Update summary cards
-            self.total_sales_card.findChild(QLabel, None).setText(f"${total_sales_all:,.2f}")
-            self.total_orders_card.findChild(QLabel, None).setText(str(total_orders_all))
+            total_sales_all = float(sales.sum())
+            total_orders_all = int(orders.sum())
             avg_order_all = total_sales_all / total_orders_all if total_orders_all > 0 else 0
-            self.avg_order_card.findChild(QLabel, None).setText(f"${avg_order_all:,.2f}")
+            self.total_sales_card.findChild(QLabel, "summary_value").setText(format_money(total_sales_all))
+            self.total_orders_card.findChild(QLabel, "summary_value").setText(str(total_orders_all))
+            self.avg_order_card.findChild(QLabel, "summary_value").setText(format_money(avg_order_all))
             
-            if report_data:
-                top_location = max(report_data, key=lambda x: x['sales'])
-                self.top_location_card.findChild(QLabel, None).setText(top_location['location'])
+            if location_names:
+                top_location = location_names[int(sales.argmax())]
+                self.top_location_card.findChild(QLabel, "summary_value").setText(top_location)
             
             # Populate table
-            self.report_table.setRowCount(len(report_data))
-            for row, data in enumerate(report_data):
-                self.report_table.setItem(row, 0, QTableWidgetItem(data['location']))
-                self.report_table.setItem(row, 1, QTableWidgetItem(f"${data['sales']:,.2f}"))
-                self.report_table.setItem(row, 2, QTableWidgetItem(str(data['orders'])))
-                self.report_table.setItem(row, 3, QTableWidgetItem(f"${data['avg_order']:,.2f}"))
-                self.report_table.setItem(row, 4, QTableWidgetItem(data['top_product']))
-                
-                growth_item = QTableWidgetItem(f"{data['growth']:+.1f}%")
-                if data['growth'] > 0:
-                    growth_item.setForeground(QColor("#14B8A6"))
-                elif data['growth'] < 0:
-                    growth_item.setForeground(QColor("#D92D20"))
-                self.report_table.setItem(row, 5, growth_item)
-            
-            db.close()
+            self.report_model.set_rows(location_names, figures, top_product)
             
         except Exception as e:
             logger.error(f"Error generating cross-branch report: {e}")
             QMessageBox.critical(self, "Error", f"Failed to generate report: {str(e)}")
-
+    
+    def _on_report_failed(self, error: str):
+        """Report a failed background report query"""
+        self._pending_filter_key = None
+        QMessageBox.critical(self, "Error", f"Failed to generate report: {error}")
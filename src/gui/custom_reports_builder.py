@@ -4,16 +4,150 @@ Custom Reports Builder - Build custom reports with flexible filters and columns
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QDialog, QComboBox,
+    QTableView, QDialog, QComboBox,
     QDateEdit, QMessageBox, QFormLayout, QCheckBox,
     QListWidget, QListWidgetItem, QGroupBox, QTextEdit
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 from loguru import logger
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
 from src.database.connection import get_db_session
-from src.database.models import Order, OrderItem, Product, Customer, Staff
+from src.database.models import (
+    Order, OrderItem, Product, Customer, Staff, Inventory, Ingredient
+)
+
+
+# Bound once; the getters below call these for every cell
+format_money = "${:.2f}".format
+format_score = "{:.1f}".format
+
+# Orders fetched per round trip when streaming a report
+REPORT_BATCH_SIZE = 1000
+
+# Display value of each report column, looked up once per report rather
+# than matched against every column name for every cell
+
+SALES_COLUMN_GETTERS = {
+    "Order ID": lambda order: str(order.order_id),
+    "Date": lambda order: order.order_datetime.strftime("%Y-%m-%d %H:%M"),
+    "Customer": lambda order: (
+        f"{order.customer.first_name} {order.customer.last_name}"
+        if order.customer else "Walk-in"
+    ),
+    "Staff": lambda order: (
+        f"{order.staff.first_name} {order.staff.last_name}" if order.staff else ""
+    ),
+    "Total Amount": lambda order: format_money(order.total_amount),
+    "Payment Method": lambda order: order.payment_method or "-",
+    "Status": lambda order: order.order_status,
+}
+
+# Called with (product, qty_sold, revenue, profit)
+PRODUCT_COLUMN_GETTERS = {
+    "Product Name": lambda product, qty_sold, revenue, profit: product.name,
+    "Category": lambda product, qty_sold, revenue, profit: (
+        product.category.name if product.category else "-"
+    ),
+    "Price": lambda product, qty_sold, revenue, profit: format_money(product.price),
+    "Cost": lambda product, qty_sold, revenue, profit: (
+        format_money(product.cost_price) if product.cost_price else "-"
+    ),
+    "Quantity Sold": lambda product, qty_sold, revenue, profit: str(int(qty_sold)),
+    "Revenue": lambda product, qty_sold, revenue, profit: format_money(revenue),
+    "Profit": lambda product, qty_sold, revenue, profit: format_money(profit),
+}
+
+# Called with (customer, order_count, total_spent, last_order)
+CUSTOMER_COLUMN_GETTERS = {
+    "Customer Name": lambda customer, order_count, total_spent, last_order: (
+        f"{customer.first_name} {customer.last_name}"
+    ),
+    "Email": lambda customer, order_count, total_spent, last_order: customer.email or "-",
+    "Phone": lambda customer, order_count, total_spent, last_order: customer.phone or "-",
+    "Total Orders": lambda customer, order_count, total_spent, last_order: str(order_count),
+    "Total Spent": lambda customer, order_count, total_spent, last_order: format_money(total_spent),
+    "Loyalty Points": lambda customer, order_count, total_spent, last_order: (
+        str(customer.loyalty_points)
+    ),
+    "Last Order": lambda customer, order_count, total_spent, last_order: (
+        last_order.strftime("%Y-%m-%d") if last_order else "-"
+    ),
+}
+
+# Called with (staff, total_sales, order_count, avg_order, score)
+STAFF_COLUMN_GETTERS = {
+    "Staff Name": lambda staff, total_sales, order_count, avg_order, score: (
+        f"{staff.first_name} {staff.last_name}"
+    ),
+    "Role": lambda staff, total_sales, order_count, avg_order, score: (
+        staff.role.role_name if staff.role else "-"
+    ),
+    "Total Sales": lambda staff, total_sales, order_count, avg_order, score: format_money(total_sales),
+    "Order Count": lambda staff, total_sales, order_count, avg_order, score: str(order_count),
+    "Avg Order Value": lambda staff, total_sales, order_count, avg_order, score: format_money(avg_order),
+    "Performance Score": lambda staff, total_sales, order_count, avg_order, score: format_score(score),
+}
+
+# Called with (item, total_value); item is a row of the inventory select.
+# Ingredients have no category, so that column is always blank.
+INVENTORY_COLUMN_GETTERS = {
+    "Item Name": lambda item, total_value: item.name,
+    "Category": lambda item, total_value: "-",
+    "Current Stock": lambda item, total_value: f"{item.quantity} {item.unit}",
+    "Reorder Level": lambda item, total_value: f"{item.reorder_level} {item.unit}",
+    "Unit Cost": lambda item, total_value: (
+        format_money(item.cost_per_unit) if item.cost_per_unit else "-"
+    ),
+    "Total Value": lambda item, total_value: format_money(total_value),
+}
+
+
+class ReportTableModel(QAbstractTableModel):
+    """
+    Table model over a report's rows of display strings
+    
+    A new report replaces the headers and rows in one model reset, rather
+    than the view allocating an item per cell.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._rows = []
+    
+    def set_rows(self, headers: list, rows: list):
+        """
+        Show a new report
+        
+        Args:
+            headers: Column titles
+            rows: One tuple of display strings per row, in header order
+        """
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return None
 
 
 class CustomReportsBuilderView(QWidget):
@@ -63,10 +197,7 @@ class CustomReportsBuilderView(QWidget):
         type_layout = QHBoxLayout()
         type_layout.addWidget(QLabel("Report Type:"))
         self.report_type_combo = QComboBox()
-        self.report_type_combo.addItems([
-            "Sales Report", "Product Report", "Customer Report", 
-            "Staff Report", "Inventory Report"
-        ])
+        self.report_type_combo.addItems(list(REPORT_SPECS))
         type_layout.addWidget(self.report_type_combo)
         type_layout.addStretch()
         config_layout.addLayout(type_layout)
@@ -118,6 +249,9 @@ class CustomReportsBuilderView(QWidget):
         self.selected_columns.setMaximumHeight(150)
         self.selected_columns.setSelectionMode(QListWidget.SelectionMode.MultiSelection)
         columns_widget_layout.addWidget(self.selected_columns)
+        # Names in selected_columns, for membership checks without
+        # scanning the list widget
+        self._selected_set = set()
         
         config_layout.addWidget(columns_widget)
         
@@ -144,9 +278,11 @@ class CustomReportsBuilderView(QWidget):
         layout.addSpacing(16)
         
         # Results table
-        self.results_table = QTableWidget()
+        self.results_table = QTableView()
+        self.results_model = ReportTableModel(self)
+        self.results_table.setModel(self.results_model)
         self.results_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #C8D4E8;
                 border-radius: 8px;
                 gridline-color: #EDF3FC;
@@ -170,36 +306,25 @@ class CustomReportsBuilderView(QWidget):
         """Load available columns based on report type"""
         self.available_columns.clear()
         self.selected_columns.clear()
+        self._selected_set.clear()
         
-        report_type = self.report_type_combo.currentText()
-        
-        if report_type == "Sales Report":
-            columns = ["Order ID", "Date", "Customer", "Staff", "Total Amount", "Payment Method", "Status"]
-        elif report_type == "Product Report":
-            columns = ["Product Name", "Category", "Price", "Cost", "Quantity Sold", "Revenue", "Profit"]
-        elif report_type == "Customer Report":
-            columns = ["Customer Name", "Email", "Phone", "Total Orders", "Total Spent", "Loyalty Points", "Last Order"]
-        elif report_type == "Staff Report":
-            columns = ["Staff Name", "Role", "Total Sales", "Order Count", "Avg Order Value", "Performance Score"]
-        else:  # Inventory Report
-            columns = ["Item Name", "Category", "Current Stock", "Reorder Level", "Unit Cost", "Total Value"]
-        
-        for col in columns:
-            self.available_columns.addItem(col)
+        self._spec = REPORT_SPECS[self.report_type_combo.currentText()]
+        self.available_columns.addItems(self._spec.columns)
     
     def add_selected_columns(self):
         """Add selected columns to selected list"""
         selected = self.available_columns.selectedItems()
         for item in selected:
-            # Check if already in selected
-            existing = self.selected_columns.findItems(item.text(), Qt.MatchFlag.MatchExactly)
-            if not existing:
-                self.selected_columns.addItem(item.text())
+            text = item.text()
+            if text not in self._selected_set:
+                self._selected_set.add(text)
+                self.selected_columns.addItem(text)
     
     def remove_selected_columns(self):
         """Remove selected columns from selected list"""
         selected = self.selected_columns.selectedItems()
         for item in selected:
+            self._selected_set.discard(item.text())
             row = self.selected_columns.row(item)
             self.selected_columns.takeItem(row)
     
@@ -214,228 +339,205 @@ class CustomReportsBuilderView(QWidget):
                 QMessageBox.warning(self, "Warning", "Please select at least one column")
                 return
             
-            report_type = self.report_type_combo.currentText()
             from_date = self.from_date.date().toPyDate()
             to_date = self.to_date.date().toPyDate()
+            # Whole days, converted once for every report query
+            from_datetime = datetime.combine(from_date, datetime.min.time())
+            to_datetime = datetime.combine(to_date, datetime.max.time())
             
-            db = get_db_session()
-            
-            # Generate report based on type
-            if report_type == "Sales Report":
-                self.generate_sales_report(db, selected_cols, from_date, to_date)
-            elif report_type == "Product Report":
-                self.generate_product_report(db, selected_cols, from_date, to_date)
-            elif report_type == "Customer Report":
-                self.generate_customer_report(db, selected_cols, from_date, to_date)
-            elif report_type == "Staff Report":
-                self.generate_staff_report(db, selected_cols, from_date, to_date)
-            else:  # Inventory Report
-                self.generate_inventory_report(db, selected_cols)
+            # Closed on the way out, including when a generator raises
+            with get_db_session() as db:
+                rows = self._spec.generator(self, db, selected_cols, from_datetime, to_datetime)
             
-            db.close()
+            # One model reset instead of an item per cell
+            self.results_model.set_rows(selected_cols, rows)
             
         except Exception as e:
             logger.error(f"Error generating report: {e}")
             QMessageBox.critical(self, "Error", f"Failed to generate report: {str(e)}")
     
-    def generate_sales_report(self, db, columns, from_date, to_date):
-        """Generate sales report"""
-        from datetime import datetime
-        from_datetime = datetime.combine(from_date, datetime.min.time())
-        to_datetime = datetime.combine(to_date, datetime.max.time())
-        
-        orders = db.query(Order).filter(
-            Order.order_datetime >= from_datetime,
-            Order.order_datetime <= to_datetime
-        ).all()
-        
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
-        self.results_table.setRowCount(len(orders))
-        
-        for row, order in enumerate(orders):
-            for col_idx, col_name in enumerate(columns):
-                value = ""
-                if col_name == "Order ID":
-                    value = str(order.order_id)
-                elif col_name == "Date":
-                    value = order.order_datetime.strftime("%Y-%m-%d %H:%M")
-                elif col_name == "Customer":
-                    if order.customer:
-                        value = f"{order.customer.first_name} {order.customer.last_name}"
-                    else:
-                        value = "Walk-in"
-                elif col_name == "Staff":
-                    if order.staff:
-                        value = f"{order.staff.first_name} {order.staff.last_name}"
-                elif col_name == "Total Amount":
-                    value = f"${order.total_amount:.2f}"
-                elif col_name == "Payment Method":
-                    value = order.payment_method or "-"
-                elif col_name == "Status":
-                    value = order.order_status
-                
-                self.results_table.setItem(row, col_idx, QTableWidgetItem(value))
+    def generate_sales_report(self, db, columns, from_datetime, to_datetime):
+        """Build the sales report rows (display strings per selected column)"""
+        getters = [SALES_COLUMN_GETTERS[col_name] for col_name in columns]
+        
+        # Customers and staff load in one IN query per batch, not lazily
+        # per row; orders stream in batches instead of all being held as
+        # ORM objects while the rows are built
+        orders = db.query(Order).options(
+            selectinload(Order.customer),
+            selectinload(Order.staff)
+        ).filter(
+            Order.order_datetime.between(from_datetime, to_datetime)
+        ).order_by(Order.order_datetime).yield_per(REPORT_BATCH_SIZE)
+        
+        rows = []
+        
+        for order in orders:
+            rows.append(tuple([getter(order) for getter in getters]))
+        
+        return rows
     
-    def generate_product_report(self, db, columns, from_date, to_date):
-        """Generate product report"""
-        from datetime import datetime
-        from sqlalchemy import func
-        from_datetime = datetime.combine(from_date, datetime.min.time())
-        to_datetime = datetime.combine(to_date, datetime.max.time())
+    def generate_product_report(self, db, columns, from_datetime, to_datetime):
+        """Build the product report rows (display strings per selected column)"""
+        getters = [PRODUCT_COLUMN_GETTERS[col_name] for col_name in columns]
         
         products = db.query(Product).all()
         
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
-        self.results_table.setRowCount(len(products))
-        
-        for row, product in enumerate(products):
-            # Get sales data for this product
-            order_items = db.query(OrderItem).join(Order).filter(
-                OrderItem.product_id == product.product_id,
-                Order.order_datetime >= from_datetime,
-                Order.order_datetime <= to_datetime
-            ).all()
-            
-            qty_sold = sum(item.quantity for item in order_items)
-            revenue = sum(item.total_price for item in order_items)
+        # Quantity and revenue for every product in one grouped query,
+        # rather than loading each product's order items separately
+        sales = {
+            product_id: (qty_sold, revenue)
+            for product_id, qty_sold, revenue in db.execute(
+                select(
+                    OrderItem.product_id,
+                    func.sum(OrderItem.quantity),
+                    func.sum(OrderItem.total_price)
+                ).join(Order).where(
+                    Order.order_datetime.between(from_datetime, to_datetime)
+                ).group_by(OrderItem.product_id)
+            )
+        }
+        
+        rows = []
+        
+        for product in products:
+            qty_sold, revenue = sales.get(product.product_id, (0, 0))
             profit = revenue - (product.cost_price * qty_sold if product.cost_price else 0)
-            
-            for col_idx, col_name in enumerate(columns):
-                value = ""
-                if col_name == "Product Name":
-                    value = product.name
-                elif col_name == "Category":
-                    value = product.category.name if product.category else "-"
-                elif col_name == "Price":
-                    value = f"${product.price:.2f}"
-                elif col_name == "Cost":
-                    value = f"${product.cost_price:.2f}" if product.cost_price else "-"
-                elif col_name == "Quantity Sold":
-                    value = str(int(qty_sold))
-                elif col_name == "Revenue":
-                    value = f"${revenue:.2f}"
-                elif col_name == "Profit":
-                    value = f"${profit:.2f}"
-                
-                self.results_table.setItem(row, col_idx, QTableWidgetItem(value))
+            rows.append(tuple([
+                getter(product, qty_sold, revenue, profit) for getter in getters
+            ]))
+        
+        return rows
     
-    def generate_customer_report(self, db, columns, from_date, to_date):
-        """Generate customer report"""
-        from datetime import datetime
-        from_datetime = datetime.combine(from_date, datetime.min.time())
-        to_datetime = datetime.combine(to_date, datetime.max.time())
+    def generate_customer_report(self, db, columns, from_datetime, to_datetime):
+        """Build the customer report rows (display strings per selected column)"""
+        getters = [CUSTOMER_COLUMN_GETTERS[col_name] for col_name in columns]
         
         customers = db.query(Customer).all()
         
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
-        self.results_table.setRowCount(len(customers))
-        
-        for row, customer in enumerate(customers):
-            orders = db.query(Order).filter(
-                Order.customer_id == customer.customer_id,
-                Order.order_datetime >= from_datetime,
-                Order.order_datetime <= to_datetime
-            ).all()
-            
-            total_spent = sum(order.total_amount for order in orders)
-            last_order = max((o.order_datetime for o in orders), default=None)
-            
-            for col_idx, col_name in enumerate(columns):
-                value = ""
-                if col_name == "Customer Name":
-                    value = f"{customer.first_name} {customer.last_name}"
-                elif col_name == "Email":
-                    value = customer.email or "-"
-                elif col_name == "Phone":
-                    value = customer.phone or "-"
-                elif col_name == "Total Orders":
-                    value = str(len(orders))
-                elif col_name == "Total Spent":
-                    value = f"${total_spent:.2f}"
-                elif col_name == "Loyalty Points":
-                    value = str(customer.loyalty_points)
-                elif col_name == "Last Order":
-                    value = last_order.strftime("%Y-%m-%d") if last_order else "-"
-                
-                self.results_table.setItem(row, col_idx, QTableWidgetItem(value))
+        # Order count, spend and latest order per customer in one query
+        order_stats = {
+            customer_id: (order_count, total_spent, last_order)
+            for customer_id, order_count, total_spent, last_order in db.execute(
+                select(
+                    Order.customer_id,
+                    func.count(Order.order_id),
+                    func.sum(Order.total_amount),
+                    func.max(Order.order_datetime)
+                ).where(
+                    Order.customer_id.is_not(None),
+                    Order.order_datetime.between(from_datetime, to_datetime)
+                ).group_by(Order.customer_id)
+            )
+        }
+        
+        rows = []
+        
+        for customer in customers:
+            order_count, total_spent, last_order = order_stats.get(
+                customer.customer_id, (0, 0, None)
+            )
+            rows.append(tuple([
+                getter(customer, order_count, total_spent, last_order)
+                for getter in getters
+            ]))
+        
+        return rows
     
-    def generate_staff_report(self, db, columns, from_date, to_date):
-        """Generate staff report"""
-        from datetime import datetime
-        from_datetime = datetime.combine(from_date, datetime.min.time())
-        to_datetime = datetime.combine(to_date, datetime.max.time())
+    def generate_staff_report(self, db, columns, from_datetime, to_datetime):
+        """Build the staff report rows (display strings per selected column)"""
+        getters = [STAFF_COLUMN_GETTERS[col_name] for col_name in columns]
         
         staff_list = db.query(Staff).filter(Staff.status == 'active').all()
         
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
-        self.results_table.setRowCount(len(staff_list))
-        
-        for row, staff in enumerate(staff_list):
-            orders = db.query(Order).filter(
-                Order.staff_id == staff.staff_id,
-                Order.order_datetime >= from_datetime,
-                Order.order_datetime <= to_datetime
-            ).all()
-            
-            total_sales = sum(order.total_amount for order in orders)
-            order_count = len(orders)
+        # Sales total and order count per staff member in one query
+        staff_sales = {
+            staff_id: (total_sales, order_count)
+            for staff_id, total_sales, order_count in db.execute(
+                select(
+                    Order.staff_id,
+                    func.sum(Order.total_amount),
+                    func.count(Order.order_id)
+                ).where(
+                    Order.order_datetime.between(from_datetime, to_datetime)
+                ).group_by(Order.staff_id)
+            )
+        }
+        
+        rows = []
+        
+        # Best total among the listed staff, the 100% mark for the score
+        max_sales = max(
+            (staff_sales.get(staff.staff_id, (0, 0))[0] for staff in staff_list),
+            default=1
+        )
+        
+        for staff in staff_list:
+            total_sales, order_count = staff_sales.get(staff.staff_id, (0, 0))
             avg_order = total_sales / order_count if order_count > 0 else 0
-            
-            for col_idx, col_name in enumerate(columns):
-                value = ""
-                if col_name == "Staff Name":
-                    value = f"{staff.first_name} {staff.last_name}"
-                elif col_name == "Role":
-                    value = staff.role.role_name if staff.role else "-"
-                elif col_name == "Total Sales":
-                    value = f"${total_sales:.2f}"
-                elif col_name == "Order Count":
-                    value = str(order_count)
-                elif col_name == "Avg Order Value":
-                    value = f"${avg_order:.2f}"
-                elif col_name == "Performance Score":
-                    # Simple performance calculation
-                    max_sales = max((sum(o.total_amount for o in db.query(Order).filter(
-                        Order.staff_id == s.staff_id,
-                        Order.order_datetime >= from_datetime,
-                        Order.order_datetime <= to_datetime
-                    ).all()) for s in staff_list), default=1)
-                    score = (total_sales / max_sales * 100) if max_sales > 0 else 0
-                    value = f"{score:.1f}"
-                
-                self.results_table.setItem(row, col_idx, QTableWidgetItem(value))
+            # Simple performance calculation
+            score = (total_sales / max_sales * 100) if max_sales > 0 else 0
+            rows.append(tuple([
+                getter(staff, total_sales, order_count, avg_order, score)
+                for getter in getters
+            ]))
+        
+        return rows
     
-    def generate_inventory_report(self, db, columns):
-        """Generate inventory report"""
-        from src.database.models import Inventory
+    def generate_inventory_report(self, db, columns, from_datetime, to_datetime):
+        """
+        Build the inventory report rows (display strings per selected column)
+        
+        Stock is reported as it is now; the date range does not apply.
+        """
+        getters = [INVENTORY_COLUMN_GETTERS[col_name] for col_name in columns]
+        
+        # Only the displayed columns, joined in one statement instead of
+        # lazy loading each item's ingredient
+        inventory_items = db.execute(
+            select(
+                Ingredient.name,
+                Ingredient.cost_per_unit,
+                Inventory.quantity,
+                Inventory.unit,
+                Inventory.reorder_level
+            ).join(
+                Ingredient, Inventory.ingredient_id == Ingredient.ingredient_id
+            ).where(Inventory.status == 'active')
+        ).all()
         
-        inventory_items = db.query(Inventory).filter(Inventory.status == 'active').all()
+        rows = []
         
-        self.results_table.setColumnCount(len(columns))
-        self.results_table.setHorizontalHeaderLabels(columns)
-        self.results_table.setRowCount(len(inventory_items))
+        for item in inventory_items:
+            total_value = item.quantity * (item.cost_per_unit or 0)
+            rows.append(tuple([getter(item, total_value) for getter in getters]))
         
-        for row, item in enumerate(inventory_items):
-            total_value = item.quantity * (item.ingredient.cost_per_unit or 0)
-            
-            for col_idx, col_name in enumerate(columns):
-                value = ""
-                if col_name == "Item Name":
-                    value = item.ingredient.name
-                elif col_name == "Category":
-                    value = item.ingredient.category or "-"
-                elif col_name == "Current Stock":
-                    value = f"{item.quantity} {item.unit}"
-                elif col_name == "Reorder Level":
-                    value = f"{item.reorder_level} {item.unit}"
-                elif col_name == "Unit Cost":
-                    value = f"${item.ingredient.cost_per_unit:.2f}" if item.ingredient.cost_per_unit else "-"
-                elif col_name == "Total Value":
-                    value = f"${total_value:.2f}"
-                
-                self.results_table.setItem(row, col_idx, QTableWidgetItem(value))
+        return rows
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """Columns offered for a report type and the method that builds it"""
+    
+    columns: tuple
+    generator: Callable
+
 
+# Report types in combo order; columns follow each getter map's order
+REPORT_SPECS = {
+    "Sales Report": ReportSpec(
+        tuple(SALES_COLUMN_GETTERS), CustomReportsBuilderView.generate_sales_report
+    ),
+    "Product Report": ReportSpec(
+        tuple(PRODUCT_COLUMN_GETTERS), CustomReportsBuilderView.generate_product_report
+    ),
+    "Customer Report": ReportSpec(
+        tuple(CUSTOMER_COLUMN_GETTERS), CustomReportsBuilderView.generate_customer_report
+    ),
+    "Staff Report": ReportSpec(
+        tuple(STAFF_COLUMN_GETTERS), CustomReportsBuilderView.generate_staff_report
+    ),
+    "Inventory Report": ReportSpec(
+        tuple(INVENTORY_COLUMN_GETTERS), CustomReportsBuilderView.generate_inventory_report
+    ),
+}
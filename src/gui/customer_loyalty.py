@@ -4,21 +4,386 @@ Customer Loyalty Management - Loyalty programs, coupons, and customer segmentati
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QTabWidget, QDialog,
-    QComboBox, QDateEdit, QMessageBox, QFormLayout, QDoubleSpinBox,
-    QLineEdit, QSpinBox, QTextEdit, QCheckBox
+    QTableView, QTabWidget, QDialog, QMessageBox
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 from loguru import logger
+import numpy as np
 from datetime import date
-from src.database.connection import get_db_session
+from functools import lru_cache
+from time import monotonic
+from sqlalchemy import case, func, or_, select
+from src.database.connection import get_background_session
 from src.database.models import (
     LoyaltyProgram, Coupon, Customer, CustomerFeedback, Order
 )
-from src.utils.email_marketing import get_email_marketing
-from src.utils.sms_marketing import get_sms_marketing
-from src.gui.table_utils import enable_table_auto_resize
+from src.gui.table_utils import batch_table_updates, enable_table_auto_resize
+from src.utils.background_tasks import run_in_background
+
+
+LOYALTY_TABS_STYLE = """
+    QTabWidget::pane {
+        border: 1px solid #C8D4E8;
+        border-radius: 8px;
+        background-color: white;
+    }
+    QTabBar::tab {
+        background-color: #EDF3FC;
+        color: #2A3A55;
+        padding: 10px 20px;
+        margin-right: 2px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+    }
+    QTabBar::tab:selected {
+        background-color: white;
+        color: #2F7DFF;
+        font-weight: 600;
+    }
+"""
+
+# Shared by the buttons and tables on the tab pages
+LOYALTY_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #2F7DFF;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-size: 14px;
+        font-weight: 600;
+    }
+    QPushButton:hover {
+        background-color: #1D66EA;
+    }
+"""
+
+LOYALTY_TABLE_STYLE = """
+    QTableView {
+        border: 1px solid #C8D4E8;
+        border-radius: 8px;
+        background-color: white;
+        gridline-color: #EDF3FC;
+    }
+    QTableView::item {
+        padding: 8px;
+    }
+    QHeaderView::section {
+        background-color: #F9FAFB;
+        padding: 10px;
+        border: none;
+        border-bottom: 2px solid #C8D4E8;
+        font-weight: 600;
+    }
+"""
+
+# Characters of feedback text shown before it is cut off with "..."
+FEEDBACK_SNIPPET_LENGTH = 50
+
+# Display strings for the 1-5 star ratings (and no rating), shared by
+# every row rather than built per row
+RATING_STARS = {None: "-", 0: "-", **{stars: "⭐" * stars for stars in range(1, 6)}}
+
+# Customer segments, in display order
+SEGMENT_NAMES = (
+    "VIP (High Spenders)",
+    "Regular (Frequent)",
+    "Occasional",
+    "New/Inactive",
+)
+
+# Segmentation scans every customer and order, so a result is reused
+# for this long as long as neither table has changed
+SEGMENTATION_CACHE_SECONDS = 60
+_SEGMENTATION_CACHE = {}
+
+
+@lru_cache(maxsize=1024)
+def _format_date(value: date) -> str:
+    """Display form of a date; the same few dates recur across rows"""
+    return value.strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=1024)
+def _format_money(amount: float) -> str:
+    """Display form of a currency amount"""
+    return f"${amount:.2f}"
+
+
+# Sentiment colours, built once rather than per data() call; other
+# sentiments keep the default colour
+_SENTIMENT_FOREGROUNDS = {
+    "positive": QColor("#14B8A6"),
+    "negative": QColor("#D92D20"),
+}
+
+
+def _create_table(model):
+    """Read-only view over a loyalty table model"""
+    table = QTableView()
+    table.setModel(model)
+    table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+    enable_table_auto_resize(table)
+    return table
+
+
+class LoyaltyTableModel(QAbstractTableModel):
+    """
+    Table model over rows of display strings
+    
+    A reload replaces every row in one model reset, rather than the view
+    allocating an item per cell.
+    """
+    
+    def __init__(self, headers: list, parent=None):
+        super().__init__(parent)
+        self._headers = headers
+        self._rows = []
+    
+    def set_rows(self, rows: list):
+        """
+        Replace the rows
+        
+        Args:
+            rows: One tuple of display strings per row, in header order
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        return None
+
+
+class FeedbackTableModel(LoyaltyTableModel):
+    """Feedback rows, with the sentiment column coloured"""
+    
+    HEADERS = ["Date", "Customer", "Order #", "Rating", "Sentiment", "Feedback"]
+    SENTIMENT_COLUMN = 4
+    
+    def __init__(self, parent=None):
+        super().__init__(self.HEADERS, parent)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.ForegroundRole
+            and index.isValid()
+            and index.column() == self.SENTIMENT_COLUMN
+        ):
+            sentiment = self._rows[index.row()][self.SENTIMENT_COLUMN]
+            return _SENTIMENT_FOREGROUNDS.get(sentiment)
+        return super().data(index, role)
+
+
+def _fetch_loyalty_program_rows(db):
+    """Display rows for the loyalty programs table"""
+    programs = db.query(LoyaltyProgram).all()
+    
+    return [
+        (
+            program.program_name,
+            f"{program.points_per_currency:.2f}",
+            _format_date(program.start_date),
+            _format_date(program.end_date) if program.end_date else "No end date",
+            "Active" if program.is_active else "Inactive"
+        )
+        for program in programs
+    ]
+
+
+def _fetch_coupon_rows(db):
+    """Display rows for the coupons table"""
+    coupons = db.query(Coupon).all()
+    
+    rows = []
+    for coupon in coupons:
+        discount_str = f"{coupon.discount_value}%"
+        if coupon.discount_type == "fixed":
+            discount_str = _format_money(coupon.discount_value)
+        
+        min_purchase = _format_money(coupon.min_purchase_amount) if coupon.min_purchase_amount else "None"
+        end_date = _format_date(coupon.end_date) if coupon.end_date else "No end date"
+        rows.append((
+            coupon.coupon_code,
+            coupon.coupon_name,
+            discount_str,
+            min_purchase,
+            f"{coupon.usage_count}/{coupon.usage_limit or '∞'}",
+            end_date,
+            "Active" if coupon.is_active else "Inactive"
+        ))
+    return rows
+
+
+def _segmentation_data_key(db):
+    """Cheap fingerprint of the customer and order data behind the segments"""
+    # Counts catch deletes, which leave the latest modification alone
+    return tuple(db.execute(
+        select(
+            select(func.max(Customer.last_modified)).scalar_subquery(),
+            select(func.count(Customer.customer_id)).scalar_subquery(),
+            select(func.max(Order.last_modified)).scalar_subquery(),
+            select(func.count(Order.order_id)).scalar_subquery()
+        )
+    ).one())
+
+
+def _fetch_segmentation_rows(db):
+    """Display rows for the segmentation table, reused while still fresh"""
+    data_key = _segmentation_data_key(db)
+    cached = _SEGMENTATION_CACHE.get(data_key)
+    if cached and monotonic() - cached[0] < SEGMENTATION_CACHE_SECONDS:
+        return cached[1]
+    
+    rows = _compute_segmentation_rows(db)
+    _SEGMENTATION_CACHE.clear()
+    _SEGMENTATION_CACHE[data_key] = (monotonic(), rows)
+    return rows
+
+
+def _compute_segmentation_rows(db):
+    """Classify every customer into a segment and total each segment"""
+    # Spending and visits per customer, customers without orders
+    # included with none
+    customer_stats = select(
+        Customer.customer_id,
+        Customer.loyalty_points,
+        func.coalesce(func.sum(Order.total_amount), 0.0).label("spending"),
+        func.count(Order.order_id).label("visits")
+    ).outerjoin(
+        Order, Order.customer_id == Customer.customer_id
+    ).group_by(Customer.customer_id).subquery()
+    
+    # Simple segmentation logic, classified and totalled in SQL so
+    # only one row per segment comes back; codes index SEGMENT_NAMES
+    segment = case(
+        (or_(customer_stats.c.spending > 1000, customer_stats.c.loyalty_points > 500), 0),
+        (customer_stats.c.visits > 10, 1),
+        (customer_stats.c.visits > 0, 2),
+        else_=3
+    ).label("segment")
+    
+    # (code, count, spending, visits) per non-empty segment, as columns
+    codes, segment_counts, segment_spending, segment_visits = np.array(
+        db.execute(
+            select(
+                segment,
+                func.count(),
+                func.sum(customer_stats.c.spending),
+                func.sum(customer_stats.c.visits)
+            ).group_by(segment)
+        ).all(),
+        dtype='f8'
+    ).reshape(-1, 4).T
+    codes = codes.astype('i8')
+    
+    # Scattered into one slot per segment, so empty segments show as zeros
+    counts = np.zeros(len(SEGMENT_NAMES), dtype='i8')
+    spending = np.zeros(len(SEGMENT_NAMES), dtype='f8')
+    visits = np.zeros(len(SEGMENT_NAMES), dtype='f8')
+    counts[codes] = segment_counts
+    spending[codes] = segment_spending
+    visits[codes] = segment_visits
+    
+    avg_spending = np.divide(spending, counts, out=np.zeros_like(spending), where=counts > 0)
+    avg_visits = np.divide(visits, counts, out=np.zeros_like(visits), where=counts > 0)
+    
+    # Display in table
+    return [
+        (
+            SEGMENT_NAMES[code],
+            str(counts[code]),
+            _format_money(avg_spending[code]),
+            f"{avg_visits[code]:.1f}",
+            _format_money(spending[code])
+        )
+        for code in range(len(SEGMENT_NAMES))
+    ]
+
+
+def _fetch_feedback_rows(db):
+    """Display rows for the feedback table"""
+    # Only the displayed fields, with the customer's name joined in
+    # rather than lazy loaded per row
+    feedback_list = db.execute(
+        select(
+            CustomerFeedback.feedback_date,
+            CustomerFeedback.order_id,
+            CustomerFeedback.rating,
+            CustomerFeedback.sentiment,
+            # One character past the cut is enough to tell it was cut
+            func.substr(
+                CustomerFeedback.feedback_text, 1, FEEDBACK_SNIPPET_LENGTH + 1
+            ).label("snippet"),
+            # Built in SQL; feedback without a customer joins to NULL
+            func.coalesce(
+                Customer.first_name + " " + Customer.last_name, "Anonymous"
+            ).label("customer_name")
+        ).outerjoin(
+            Customer, CustomerFeedback.customer_id == Customer.customer_id
+        ).order_by(
+            CustomerFeedback.feedback_date.desc()
+        ).limit(100)
+    ).all()
+    
+    if not feedback_list:
+        return []
+    
+    # Every date formatted in one pass, e.g. "2024-05-01T09:30" with the
+    # T swapped for a space. numpy rather than pandas.read_sql: the rows
+    # are already fetched, and nothing else on the GUI path loads pandas.
+    feedback_dates = np.char.replace(
+        np.datetime_as_string(
+            np.array([feedback.feedback_date for feedback in feedback_list], dtype='datetime64[m]'),
+            unit='m'
+        ),
+        "T", " "
+    )
+    
+    rows = []
+    for feedback, feedback_date in zip(feedback_list, feedback_dates.tolist()):
+        order_num = f"#{feedback.order_id}" if feedback.order_id else "-"
+        rating = RATING_STARS.get(feedback.rating) or "⭐" * feedback.rating
+        feedback_text = feedback.snippet or "-"
+        if len(feedback_text) > FEEDBACK_SNIPPET_LENGTH:
+            feedback_text = feedback_text[:FEEDBACK_SNIPPET_LENGTH] + "..."
+        rows.append((
+            feedback_date,
+            feedback.customer_name,
+            order_num,
+            rating,
+            feedback.sentiment or "-",
+            feedback_text
+        ))
+    return rows
+
+
+def _fetch_tab_rows(loads):
+    """
+    Run row fetchers through one read-only session (runs on a pool thread)
+    
+    Args:
+        loads: (tab index, row fetcher) pairs
+    
+    Returns:
+        (tab index, rows) pairs
+    """
+    with get_background_session() as db:
+        return [(index, fetch(db)) for index, fetch in loads]
 
 
 class CustomerLoyaltyView(QWidget):
@@ -28,7 +393,6 @@ class CustomerLoyaltyView(QWidget):
         super().__init__(parent)
         self.user_id = user_id
         self.setup_ui()
-        self.load_data()
     
     def setup_ui(self):
         """Setup customer loyalty UI"""
@@ -53,49 +417,55 @@ class CustomerLoyaltyView(QWidget):
         
         # Tabs
         self.tabs = QTabWidget()
-        self.tabs.setStyleSheet("""
-            QTabWidget::pane {
-                border: 1px solid #C8D4E8;
-                border-radius: 8px;
-                background-color: white;
-            }
-            QTabBar::tab {
-                background-color: #EDF3FC;
-                color: #2A3A55;
-                padding: 10px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                color: #2F7DFF;
-                font-weight: 600;
-            }
-        """)
-        
-        # Loyalty Programs tab
-        self.loyalty_tab = self.create_loyalty_programs_tab()
-        self.tabs.addTab(self.loyalty_tab, "Loyalty Programs")
-        
-        # Coupons tab
-        self.coupons_tab = self.create_coupons_tab()
-        self.tabs.addTab(self.coupons_tab, "Coupons")
-        
-        # Customer Segmentation tab
-        self.segmentation_tab = self.create_segmentation_tab()
-        self.tabs.addTab(self.segmentation_tab, "Customer Segmentation")
-        
-        # Feedback tab
-        self.feedback_tab = self.create_feedback_tab()
-        self.tabs.addTab(self.feedback_tab, "Customer Feedback")
-        
-        # Marketing tab
-        self.marketing_tab = self.create_marketing_tab()
-        self.tabs.addTab(self.marketing_tab, "Email & SMS Marketing")
+        # Buttons and tables on every page inherit their styles from here
+        self.tabs.setStyleSheet(LOYALTY_TABS_STYLE + LOYALTY_BUTTON_STYLE + LOYALTY_TABLE_STYLE)
+        
+        # Each tab starts as an empty page; its contents are built and its
+        # data loaded the first time it is shown. Entries are (create the
+        # page, fetch its rows off the GUI thread, show the fetched rows).
+        self._tab_builders = [
+            (self.create_loyalty_programs_tab, _fetch_loyalty_program_rows, self._on_loyalty_programs_loaded),
+            (self.create_coupons_tab, _fetch_coupon_rows, self._on_coupons_loaded),
+            (self.create_segmentation_tab, _fetch_segmentation_rows, self._on_segmentation_loaded),
+            (self.create_feedback_tab, _fetch_feedback_rows, self._on_feedback_loaded),
+            (self.create_marketing_tab, None, None),
+        ]
+        self._built_tabs = set()
+        # Signals of each load in flight -> the tab indexes it loads. The
+        # slots look their own load up through sender(): binding the indexes
+        # with partial() would outlive the view and crash if it is deleted
+        # before the load returns.
+        self._tab_loads = {}
+        
+        self.loyalty_tab = self.add_lazy_tab("Loyalty Programs")
+        self.coupons_tab = self.add_lazy_tab("Coupons")
+        self.segmentation_tab = self.add_lazy_tab("Customer Segmentation")
+        self.feedback_tab = self.add_lazy_tab("Customer Feedback")
+        self.marketing_tab = self.add_lazy_tab("Email & SMS Marketing")
+        
+        self.tabs.currentChanged.connect(self.build_tab)
+        self.build_tab(self.tabs.currentIndex())
         
         layout.addWidget(self.tabs)
     
+    def add_lazy_tab(self, title: str) -> QWidget:
+        """Add an empty page for build_tab to fill in"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(page, title)
+        return page
+    
+    def build_tab(self, index: int):
+        """Build a tab's contents and load its data, the first time only"""
+        if index < 0 or index in self._built_tabs:
+            return
+        self._built_tabs.add(index)
+        
+        create_tab = self._tab_builders[index][0]
+        self.tabs.widget(index).layout().addWidget(create_tab())
+        self.load_tabs([index])
+    
     def create_loyalty_programs_tab(self):
         """Create loyalty programs tab"""
         widget = QWidget()
@@ -109,20 +479,16 @@ class CustomerLoyaltyView(QWidget):
         header.addStretch()
         
         add_btn = QPushButton("Add Program")
-        add_btn.setStyleSheet(self.get_button_style())
         add_btn.clicked.connect(self.handle_add_loyalty_program)
         header.addWidget(add_btn)
         
         layout.addLayout(header)
         
         # Programs table
-        self.loyalty_table = QTableWidget()
-        self.loyalty_table.setColumnCount(5)
-        self.loyalty_table.setHorizontalHeaderLabels([
+        self.loyalty_model = LoyaltyTableModel([
             "Program Name", "Points per $", "Start Date", "End Date", "Status"
-        ])
-        self.loyalty_table.setStyleSheet(self.get_table_style())
-        enable_table_auto_resize(self.loyalty_table)
+        ], self)
+        self.loyalty_table = _create_table(self.loyalty_model)
         layout.addWidget(self.loyalty_table)
         
         return widget
@@ -140,20 +506,16 @@ class CustomerLoyaltyView(QWidget):
         header.addStretch()
         
         add_btn = QPushButton("Add Coupon")
-        add_btn.setStyleSheet(self.get_button_style())
         add_btn.clicked.connect(self.handle_add_coupon)
         header.addWidget(add_btn)
         
         layout.addLayout(header)
         
         # Coupons table
-        self.coupons_table = QTableWidget()
-        self.coupons_table.setColumnCount(7)
-        self.coupons_table.setHorizontalHeaderLabels([
+        self.coupons_model = LoyaltyTableModel([
             "Code", "Name", "Discount", "Min Purchase", "Usage", "Valid Until", "Status"
-        ])
-        self.coupons_table.setStyleSheet(self.get_table_style())
-        enable_table_auto_resize(self.coupons_table)
+        ], self)
+        self.coupons_table = _create_table(self.coupons_model)
         layout.addWidget(self.coupons_table)
         
         return widget
@@ -182,13 +544,10 @@ class CustomerLoyaltyView(QWidget):
         layout.addSpacing(16)
         
         # Segmentation table
-        self.segmentation_table = QTableWidget()
-        self.segmentation_table.setColumnCount(5)
-        self.segmentation_table.setHorizontalHeaderLabels([
+        self.segmentation_model = LoyaltyTableModel([
             "Segment", "Customer Count", "Avg Spending", "Avg Visits", "Total Revenue"
-        ])
-        self.segmentation_table.setStyleSheet(self.get_table_style())
-        enable_table_auto_resize(self.segmentation_table)
+        ], self)
+        self.segmentation_table = _create_table(self.segmentation_model)
         layout.addWidget(self.segmentation_table)
         
         return widget
@@ -208,13 +567,8 @@ class CustomerLoyaltyView(QWidget):
         layout.addLayout(header)
         
         # Feedback table
-        self.feedback_table = QTableWidget()
-        self.feedback_table.setColumnCount(6)
-        self.feedback_table.setHorizontalHeaderLabels([
-            "Date", "Customer", "Order #", "Rating", "Sentiment", "Feedback"
-        ])
-        self.feedback_table.setStyleSheet(self.get_table_style())
-        enable_table_auto_resize(self.feedback_table)
+        self.feedback_model = FeedbackTableModel(self)
+        self.feedback_table = _create_table(self.feedback_model)
         layout.addWidget(self.feedback_table)
         
         return widget
@@ -233,7 +587,6 @@ class CustomerLoyaltyView(QWidget):
         
         email_layout = QHBoxLayout()
         send_email_btn = QPushButton("Send Promotional Email")
-        send_email_btn.setStyleSheet(self.get_button_style())
         send_email_btn.clicked.connect(self.handle_send_email_campaign)
         email_layout.addWidget(send_email_btn)
         email_layout.addStretch()
@@ -248,7 +601,6 @@ class CustomerLoyaltyView(QWidget):
         
         sms_layout = QHBoxLayout()
         send_sms_btn = QPushButton("Send Promotional SMS")
-        send_sms_btn.setStyleSheet(self.get_button_style())
         send_sms_btn.clicked.connect(self.handle_send_sms_campaign)
         sms_layout.addWidget(send_sms_btn)
         sms_layout.addStretch()
@@ -271,150 +623,69 @@ class CustomerLoyaltyView(QWidget):
         dialog.exec()
     
     def load_data(self):
-        """Load all loyalty data"""
-        self.load_loyalty_programs()
-        self.load_coupons()
-        self.load_segmentation()
-        self.load_feedback()
+        """Reload the data of every tab built so far"""
+        self.load_tabs(self._built_tabs)
+    
+    def load_tabs(self, indexes):
+        """Reload the given built tabs in one background task and session"""
+        loads = [
+            (index, self._tab_builders[index][1])
+            for index in sorted(indexes)
+            if self._tab_builders[index][1] is not None
+        ]
+        if loads:
+            task = run_in_background(
+                _fetch_tab_rows,
+                loads,
+                on_finished=self._on_tabs_loaded,
+                on_failed=self._on_tabs_failed,
+            )
+            self._tab_loads[task.signals] = [index for index, _fetch in loads]
+    
+    def _on_tabs_loaded(self, results):
+        """Hand the rows fetched by _fetch_tab_rows to each tab"""
+        self._tab_loads.pop(self.sender(), None)
+        for index, rows in results:
+            show_rows = self._tab_builders[index][2]
+            show_rows(rows)
+    
+    def _on_tabs_failed(self, error: str):
+        """Empty the tables of the load that failed and report it"""
+        logger.error(f"Error loading loyalty data: {error}")
+        for index in self._tab_loads.pop(self.sender(), []):
+            show_rows = self._tab_builders[index][2]
+            show_rows([])
+        QMessageBox.critical(self, "Error", f"Failed to load loyalty data: {error}")
     
     def load_loyalty_programs(self):
-        """Load loyalty programs"""
-        try:
-            db = get_db_session()
-            programs = db.query(LoyaltyProgram).all()
-            
-            self.loyalty_table.setRowCount(len(programs))
-            for row, program in enumerate(programs):
-                self.loyalty_table.setItem(row, 0, QTableWidgetItem(program.program_name))
-                self.loyalty_table.setItem(row, 1, QTableWidgetItem(f"{program.points_per_currency:.2f}"))
-                self.loyalty_table.setItem(row, 2, QTableWidgetItem(program.start_date.strftime("%Y-%m-%d")))
-                end_date = program.end_date.strftime("%Y-%m-%d") if program.end_date else "No end date"
-                self.loyalty_table.setItem(row, 3, QTableWidgetItem(end_date))
-                status_item = QTableWidgetItem("Active" if program.is_active else "Inactive")
-                self.loyalty_table.setItem(row, 4, status_item)
-            
-            db.close()
-        except Exception as e:
-            logger.error(f"Error loading loyalty programs: {e}")
+        """Reload the loyalty programs table"""
+        self.load_tabs([self.tabs.indexOf(self.loyalty_tab)])
     
     def load_coupons(self):
-        """Load coupons"""
-        try:
-            db = get_db_session()
-            coupons = db.query(Coupon).all()
-            
-            self.coupons_table.setRowCount(len(coupons))
-            for row, coupon in enumerate(coupons):
-                self.coupons_table.setItem(row, 0, QTableWidgetItem(coupon.coupon_code))
-                self.coupons_table.setItem(row, 1, QTableWidgetItem(coupon.coupon_name))
-                
-                discount_str = f"{coupon.discount_value}%"
-                if coupon.discount_type == "fixed":
-                    discount_str = f"${coupon.discount_value:.2f}"
-                self.coupons_table.setItem(row, 2, QTableWidgetItem(discount_str))
-                
-                min_purchase = f"${coupon.min_purchase_amount:.2f}" if coupon.min_purchase_amount else "None"
-                self.coupons_table.setItem(row, 3, QTableWidgetItem(min_purchase))
-                self.coupons_table.setItem(row, 4, QTableWidgetItem(f"{coupon.usage_count}/{coupon.usage_limit or '∞'}"))
-                end_date = coupon.end_date.strftime("%Y-%m-%d") if coupon.end_date else "No end date"
-                self.coupons_table.setItem(row, 5, QTableWidgetItem(end_date))
-                status_item = QTableWidgetItem("Active" if coupon.is_active else "Inactive")
-                self.coupons_table.setItem(row, 6, status_item)
-            
-            db.close()
-        except Exception as e:
-            logger.error(f"Error loading coupons: {e}")
-    
-    def load_segmentation(self):
-        """Load customer segmentation"""
-        try:
-            db = get_db_session()
-            
-            # Get all customers with their order data
-            customers = db.query(Customer).all()
-            
-            segments = {
-                "VIP (High Spenders)": {"count": 0, "total_spending": 0.0, "total_visits": 0},
-                "Regular (Frequent)": {"count": 0, "total_spending": 0.0, "total_visits": 0},
-                "Occasional": {"count": 0, "total_spending": 0.0, "total_visits": 0},
-                "New/Inactive": {"count": 0, "total_spending": 0.0, "total_visits": 0}
-            }
-            
-            for customer in customers:
-                orders = db.query(Order).filter(Order.customer_id == customer.customer_id).all()
-                total_spending = sum(o.total_amount for o in orders)
-                visit_count = len(orders)
-                
-                # Simple segmentation logic
-                if total_spending > 1000 or customer.loyalty_points > 500:
-                    segment = "VIP (High Spenders)"
-                elif visit_count > 10:
-                    segment = "Regular (Frequent)"
-                elif visit_count > 0:
-                    segment = "Occasional"
-                else:
-                    segment = "New/Inactive"
-                
-                segments[segment]["count"] += 1
-                segments[segment]["total_spending"] += total_spending
-                segments[segment]["total_visits"] += visit_count
-            
-            # Display in table
-            self.segmentation_table.setRowCount(len(segments))
-            for row, (segment_name, data) in enumerate(segments.items()):
-                self.segmentation_table.setItem(row, 0, QTableWidgetItem(segment_name))
-                self.segmentation_table.setItem(row, 1, QTableWidgetItem(str(data["count"])))
-                
-                avg_spending = data["total_spending"] / data["count"] if data["count"] > 0 else 0
-                self.segmentation_table.setItem(row, 2, QTableWidgetItem(f"${avg_spending:.2f}"))
-                
-                avg_visits = data["total_visits"] / data["count"] if data["count"] > 0 else 0
-                self.segmentation_table.setItem(row, 3, QTableWidgetItem(f"{avg_visits:.1f}"))
-                
-                self.segmentation_table.setItem(row, 4, QTableWidgetItem(f"${data['total_spending']:.2f}"))
-            
-            db.close()
-        except Exception as e:
-            logger.error(f"Error loading segmentation: {e}")
-    
-    def load_feedback(self):
-        """Load customer feedback"""
-        try:
-            db = get_db_session()
-            feedback_list = db.query(CustomerFeedback).order_by(
-                CustomerFeedback.feedback_date.desc()
-            ).limit(100).all()
-            
-            self.feedback_table.setRowCount(len(feedback_list))
-            for row, feedback in enumerate(feedback_list):
-                self.feedback_table.setItem(row, 0, QTableWidgetItem(
-                    feedback.feedback_date.strftime("%Y-%m-%d %H:%M")
-                ))
-                
-                customer_name = "Anonymous"
-                if feedback.customer:
-                    customer_name = f"{feedback.customer.first_name} {feedback.customer.last_name}"
-                self.feedback_table.setItem(row, 1, QTableWidgetItem(customer_name))
-                
-                order_num = f"#{feedback.order_id}" if feedback.order_id else "-"
-                self.feedback_table.setItem(row, 2, QTableWidgetItem(order_num))
-                
-                rating = "⭐" * (feedback.rating or 0) if feedback.rating else "-"
-                self.feedback_table.setItem(row, 3, QTableWidgetItem(rating))
-                
-                sentiment_item = QTableWidgetItem(feedback.sentiment or "-")
-                if feedback.sentiment == "positive":
-                    sentiment_item.setForeground(QColor("#14B8A6"))
-                elif feedback.sentiment == "negative":
-                    sentiment_item.setForeground(QColor("#D92D20"))
-                self.feedback_table.setItem(row, 4, sentiment_item)
-                
-                feedback_text = (feedback.feedback_text or "")[:50] + "..." if feedback.feedback_text and len(feedback.feedback_text) > 50 else (feedback.feedback_text or "-")
-                self.feedback_table.setItem(row, 5, QTableWidgetItem(feedback_text))
-            
-            db.close()
-        except Exception as e:
-            logger.error(f"Error loading feedback: {e}")
+        """Reload the coupons table"""
+        self.load_tabs([self.tabs.indexOf(self.coupons_tab)])
+    
+    def _on_loyalty_programs_loaded(self, rows):
+        """Show the loyalty programs fetched by _fetch_loyalty_program_rows"""
+        self._show_rows(self.loyalty_table, self.loyalty_model, rows)
+    
+    def _on_coupons_loaded(self, rows):
+        """Show the coupons fetched by _fetch_coupon_rows"""
+        self._show_rows(self.coupons_table, self.coupons_model, rows)
+    
+    def _on_segmentation_loaded(self, rows):
+        """Show the segments fetched by _fetch_segmentation_rows"""
+        self._show_rows(self.segmentation_table, self.segmentation_model, rows)
+    
+    def _on_feedback_loaded(self, rows):
+        """Show the feedback fetched by _fetch_feedback_rows"""
+        self._show_rows(self.feedback_table, self.feedback_model, rows)
+    
+    def _show_rows(self, table, model, rows):
+        """Swap a table's rows in with one repaint and column resize"""
+        with batch_table_updates(table):
+            model.set_rows(rows)
+            table.resizeColumnsToContents()
     
     def handle_add_loyalty_program(self):
         """Handle add loyalty program"""
@@ -429,42 +700,3 @@ class CustomerLoyaltyView(QWidget):
         dialog = AddCouponDialog(self.user_id, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.load_coupons()  # Refresh the list
-    
-    def get_button_style(self):
-        """Get standard button style"""
-        return """
-            QPushButton {
-                background-color: #2F7DFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #1D66EA;
-            }
-        """
-    
-    def get_table_style(self):
-        """Get standard table style"""
-        return """
-            QTableWidget {
-                border: 1px solid #C8D4E8;
-                border-radius: 8px;
-                background-color: white;
-                gridline-color: #EDF3FC;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QHeaderView::section {
-                background-color: #F9FAFB;
-                padding: 10px;
-                border: none;
-                border-bottom: 2px solid #C8D4E8;
-                font-weight: 600;
-            }
-        """
-
@@ -2,6 +2,7 @@
 Shared table helpers for consistent sizing and appearance.
 """
 
+from contextlib import contextmanager
 from PyQt6.QtCore import QObject, QEvent
 from PyQt6.QtWidgets import QHeaderView, QTableWidget, QTableView, QApplication
 from src.gui.design_system import DATA_TABLE_STYLE
@@ -47,6 +48,26 @@ def apply_modern_table_chrome(table) -> None:
     setattr(table, "_modern_table_applied", True)
 
 
+@contextmanager
+def batch_table_updates(table):
+    """
+    Suspend repaints, sorting and signals while a table is bulk-populated.
+
+    Sorting is restored to its previous state on exit so tables that rely on
+    SQL ordering are not re-sorted by the view.
+    """
+    sorting_enabled = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    table.setSortingEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setSortingEnabled(sorting_enabled)
+        table.setUpdatesEnabled(True)
+
+
 class _TableAutoResizeFilter(QObject):
     """Event filter that ensures every table auto-resizes its columns."""
     
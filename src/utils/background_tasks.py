@@ -0,0 +1,70 @@
+"""
+Background tasks - run blocking work (database queries, network sync) on the
+shared QThreadPool and deliver results back to the GUI thread via signals.
+"""
+
+from typing import Any, Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from loguru import logger
+
+
+class BackgroundTaskSignals(QObject):
+    """Signals emitted by a BackgroundTask (delivered on the GUI thread)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BackgroundTask(QRunnable):
+    """
+    Runnable wrapping a plain callable.
+
+    The callable runs on a pool thread, so it must open its own database
+    session with get_background_session(). Sessions from get_db_session()
+    all share the GUI thread's connection, and closing one there would
+    roll back whatever the GUI thread has not committed yet.
+    """
+
+    def __init__(self, fn: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = BackgroundTaskSignals()
+
+    def run(self):
+        """Run the callable and emit its result or error"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.error(f"Background task {getattr(self.fn, '__name__', self.fn)} failed: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(
+    fn: Callable[..., Any],
+    *args,
+    on_finished: Optional[Callable[[Any], None]] = None,
+    on_failed: Optional[Callable[[str], None]] = None,
+    **kwargs
+) -> BackgroundTask:
+    """
+    Submit fn(*args, **kwargs) to the global QThreadPool
+
+    Args:
+        fn: Blocking callable to run off the GUI thread
+        on_finished: Slot receiving the return value
+        on_failed: Slot receiving the error message
+
+    Returns:
+        The submitted task
+    """
+    task = BackgroundTask(fn, *args, **kwargs)
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        task.signals.failed.connect(on_failed)
+    QThreadPool.globalInstance().start(task)
+    return task
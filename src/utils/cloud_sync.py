@@ -5,7 +5,7 @@ Cloud Sync Infrastructure - Multi-location data synchronization
 from loguru import logger
 from typing import List, Dict, Optional
 from datetime import datetime
-from src.database.connection import get_db_session
+from src.database.connection import get_background_session
 from src.database.models import BaseModel, Location, Order, Product, Inventory
 
 
@@ -47,7 +47,7 @@ class CloudSyncManager:
             return {'success': False, 'message': 'Cloud sync not configured'}
         
         try:
-            db = get_db_session()
+            db = get_background_session()
             
             # Get local orders that need syncing
             if last_sync_time:
@@ -97,7 +97,7 @@ class CloudSyncManager:
             return {'success': False, 'message': 'Cloud sync not configured'}
         
         try:
-            db = get_db_session()
+            db = get_background_session()
             
             # Get local inventory that needs syncing
             if last_sync_time:
@@ -140,7 +140,7 @@ class CloudSyncManager:
             return {'success': False, 'message': 'Cloud sync not configured'}
         
         try:
-            db = get_db_session()
+            db = get_background_session()
             
             # Get local products that need syncing
             if last_sync_time:
@@ -180,19 +180,11 @@ class CloudSyncManager:
             return {'success': False, 'message': 'Cloud sync not configured'}
         
         try:
-            results = {
+            return combine_sync_results({
                 'orders': self.sync_orders(),
                 'inventory': self.sync_inventory(),
                 'products': self.sync_products()
-            }
-            
-            all_success = all(r.get('success', False) for r in results.values())
-            
-            return {
-                'success': all_success,
-                'results': results,
-                'message': 'Full sync completed' if all_success else 'Some syncs failed'
-            }
+            })
             
         except Exception as e:
             logger.error(f"Error in full sync: {e}")
@@ -216,6 +208,25 @@ class CloudSyncManager:
         }
 
 
+def combine_sync_results(results: Dict[str, Dict]) -> Dict:
+    """
+    Merge per-area sync results into one full sync result
+    
+    Args:
+        results: Mapping of area name ('orders', 'inventory', ...) to its result
+        
+    Returns:
+        Dictionary with overall success, the per-area results and a message
+    """
+    all_success = all(r.get('success', False) for r in results.values())
+    
+    return {
+        'success': all_success,
+        'results': results,
+        'message': 'Full sync completed' if all_success else 'Some syncs failed'
+    }
+
+
 def get_cloud_sync_manager() -> CloudSyncManager:
     """Get global cloud sync manager instance"""
     return CloudSyncManager()
@@ -0,0 +1,49 @@
+"""
+Event Profiler - Log Qt events that take long enough to stall the UI
+"""
+
+from PyQt6 import sip
+from PyQt6.QtCore import QElapsedTimer
+from PyQt6.QtWidgets import QApplication
+from loguru import logger
+
+
+class ProfilingApplication(QApplication):
+    """
+    QApplication that times every event delivery.
+
+    Events slower than the threshold are logged with their type and
+    receiver, pointing at the widget or slot that blocks the event loop.
+    Overriding notify() puts Python on every event's path, so this is only
+    meant for debugging sessions ([Debug] profile_events in config.ini).
+    """
+
+    def __init__(self, argv, slow_event_ms: int = 10):
+        super().__init__(argv)
+        self.slow_event_ms = slow_event_ms
+
+    def notify(self, receiver, event):
+        timer = QElapsedTimer()
+        timer.start()
+        event_type = event.type()
+        result = super().notify(receiver, event)
+        elapsed = timer.elapsed()
+        if elapsed > self.slow_event_ms:
+            logger.warning(
+                f"Slow event: {getattr(event_type, 'name', event_type)} -> "
+                f"{_describe_receiver(receiver)} took {elapsed} ms"
+            )
+        return result
+
+
+def _describe_receiver(receiver) -> str:
+    """Class name (plus object name, if set) of an event receiver"""
+    if receiver is None:
+        return "None"
+    if sip.isdeleted(receiver):
+        # e.g. the receiver of a DeferredDelete event
+        return f"{type(receiver).__name__} (deleted)"
+    name = receiver.metaObject().className()
+    if receiver.objectName():
+        name = f"{name}#{receiver.objectName()}"
+    return name
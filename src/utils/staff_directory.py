@@ -0,0 +1,52 @@
+"""
+Staff Directory - Cached staff name lookups for selection combos
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import event
+
+from src.database.connection import get_db_session
+from src.database.models import Staff
+
+
+StaffChoice = Tuple[int, str]
+
+
+@lru_cache(maxsize=2)
+def _load_staff_choices(active_only: bool) -> Tuple[StaffChoice, ...]:
+    """Query (staff_id, full name) pairs; cached until a Staff row changes."""
+    db = get_db_session()
+    try:
+        query = db.query(Staff.staff_id, Staff.first_name, Staff.last_name)
+        if active_only:
+            query = query.filter(Staff.status == 'active')
+        return tuple(
+            (staff_id, f"{first_name} {last_name}")
+            for staff_id, first_name, last_name in query.all()
+        )
+    finally:
+        db.close()
+
+
+def get_staff_choices(active_only: bool = True) -> Tuple[StaffChoice, ...]:
+    """
+    Get staff members for populating combo boxes
+
+    Args:
+        active_only: Only include staff with an active status
+
+    Returns:
+        Tuple of (staff_id, "First Last") pairs
+    """
+    return _load_staff_choices(active_only)
+
+
+def invalidate_staff_choices(*_args) -> None:
+    """Drop cached staff lists so the next lookup re-queries the database"""
+    _load_staff_choices.cache_clear()
+
+
+for _event_name in ("after_insert", "after_update", "after_delete"):
+    event.listen(Staff, _event_name, invalidate_staff_choices)
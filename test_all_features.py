@@ -640,6 +640,98 @@ def test_calculations():
         log_test(category, "Dashboard analytics import", False, str(e))
 
 
+def test_coupon_evaluation():
+    """Test coupon validity and discount rules"""
+    category = "Coupon Evaluation"
+    print(f"\n{'='*60}")
+    print(f"Testing: {category}")
+    print(f"{'='*60}")
+    
+    try:
+        from collections import namedtuple
+        from src.gui.coupon_redemption_dialog import _evaluate_coupon
+        
+        log_test(category, "Coupon evaluation import", True)
+        
+        # Same fields as the rows _fetch_coupon returns
+        CouponRow = namedtuple("CouponRow", [
+            "coupon_id", "coupon_code", "coupon_name", "discount_type",
+            "discount_value", "min_purchase_amount", "max_discount_amount",
+            "usage_limit", "usage_count", "start_date", "end_date",
+        ])
+        today = date(2024, 6, 15)
+        
+        def coupon(**overrides):
+            fields = dict(
+                coupon_id=1, coupon_code="SAVE10", coupon_name="Save 10",
+                discount_type="percentage", discount_value=10.0,
+                min_purchase_amount=None, max_discount_amount=None,
+                usage_limit=None, usage_count=0,
+                start_date=date(2024, 6, 1), end_date=date(2024, 6, 30),
+            )
+            fields.update(overrides)
+            return CouponRow(**fields)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(start_date=date(2024, 6, 16)), 100.0, today
+        )
+        log_test(category, "Rejected before start date",
+                 not ok and "not yet valid" in message and discount == 0.0)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(end_date=date(2024, 6, 14)), 100.0, today
+        )
+        log_test(category, "Rejected after end date",
+                 not ok and "expired" in message and discount == 0.0)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(usage_limit=5, usage_count=5), 100.0, today
+        )
+        log_test(category, "Rejected at usage limit",
+                 not ok and "usage limit" in message and discount == 0.0)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(min_purchase_amount=50.0), 49.99, today
+        )
+        log_test(category, "Rejected below minimum purchase",
+                 not ok and "$50.00" in message and discount == 0.0)
+        
+        ok, message, discount = _evaluate_coupon(coupon(), 80.0, today)
+        log_test(category, "Percentage discount",
+                 ok and message == "Save 10 - 10.0% off" and abs(discount - 8.0) < 0.001)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(discount_value=50.0, max_discount_amount=20.0), 100.0, today
+        )
+        log_test(category, "Percentage discount capped at max discount",
+                 ok and abs(discount - 20.0) < 0.001)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(discount_type="fixed", discount_value=15.0), 100.0, today
+        )
+        log_test(category, "Fixed discount",
+                 ok and message == "Save 10 - $15.00 off" and abs(discount - 15.0) < 0.001)
+        
+        ok, message, discount = _evaluate_coupon(
+            coupon(discount_type="fixed", discount_value=15.0), 10.0, today
+        )
+        log_test(category, "Fixed discount limited to order total",
+                 ok and abs(discount - 10.0) < 0.001)
+        
+        # An equal (row, total, today) is answered from the cache
+        first = _evaluate_coupon(coupon(coupon_code="CACHED"), 42.0, today)
+        hits = _evaluate_coupon.cache_info().hits
+        second = _evaluate_coupon(coupon(coupon_code="CACHED"), 42.0, today)
+        log_test(category, "Equal inputs reuse the cached result",
+                 second is first and _evaluate_coupon.cache_info().hits == hits + 1)
+        
+        redeemed = _evaluate_coupon(coupon(coupon_code="CACHED", usage_count=1), 42.0, today)
+        log_test(category, "Changed usage count is evaluated afresh",
+                 redeemed is not first and _evaluate_coupon.cache_info().hits == hits + 1)
+    except Exception as e:
+        log_test(category, "Coupon evaluation", False, str(e))
+
+
 def test_predictive_analytics():
     """Test predictive analytics"""
     category = "Predictive Analytics"
@@ -1453,6 +1545,7 @@ def main():
     
     # Business Logic Tests
     test_calculations()
+    test_coupon_evaluation()
     test_predictive_analytics()
     
     # Utility Tests